@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: RecursiveTextSplitter vs LangChain's RecursiveCharacterTextSplitter
+on the per-page path used by ProcessController.process_document.
+
+Run from src/:  python -m benchmarks.text_splitter_benchmark [--pages 400] [--repeat 5]
+"""
+import argparse
+import logging
+import random
+import time
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from utils import RecursiveTextSplitter
+
+SEPARATORS = ["\n\n", "\n", " ", ""]
+WORDS = "python engineer data kubernetes resume experience project team lead senior".split()
+
+
+def make_pages(count: int, seed: int = 0) -> list[Document]:
+    rng = random.Random(seed)
+    pages = []
+    for number in range(count):
+        text = "\n\n".join(
+            "\n".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 20))) for _ in range(rng.randint(1, 8)))
+            for _ in range(8)
+        )
+        pages.append(Document(
+            page_content=text,
+            metadata={"source": "/tmp/doc.pdf", "file_path": "/tmp/doc.pdf", "total_pages": count, "page": number},
+        ))
+    return pages
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    pages = make_pages(args.pages)
+    total_chars = sum(len(page.page_content) for page in pages)
+    print(f"{len(pages)} pages, {total_chars} characters, best of {args.repeat}")
+
+    for chunk_size, chunk_overlap in [(600, 200), (1000, 200)]:
+        langchain = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=SEPARATORS, length_function=len
+        )
+        native = RecursiveTextSplitter(chunk_size, chunk_overlap, SEPARATORS)
+
+        def run_langchain():
+            return [(doc.page_content, {**doc.metadata, "file_id": "f"}) for doc in langchain.split_documents(pages)]
+
+        def run_native():
+            return [(text, {**page.metadata, "file_id": "f"}) for page in pages for text in native.split_text(page.page_content)]
+
+        assert run_langchain() == run_native()
+        langchain_time = best_of(args.repeat, run_langchain)
+        native_time = best_of(args.repeat, run_native)
+        print(
+            f"chunk_size={chunk_size} overlap={chunk_overlap}: "
+            f"langchain {langchain_time * 1000:.1f} ms, native {native_time * 1000:.1f} ms, "
+            f"{langchain_time / native_time:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ class BaseController:
         self.assets_dir=os.path.join(self.base_dir,self.app_settings.UPLOAD_DIRECTORY)
 
         self.db_directory=os.path.join(self.base_dir,self.app_settings.DB_DIRECTORY)
+        self.store_dir=os.path.join(self.base_dir,self.app_settings.ASSET_STORE_DIRECTORY)
 
     def generate_random_id(self,length=12):
         return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
@@ -19,4 +20,10 @@ class BaseController:
        database_path=os.path.join(self.db_directory,db_name)
        if not os.path.exists(database_path):
            os.makedirs(database_path)
-       return database_path
\ No newline at end of file
+       return database_path
+
+    def get_content_path(self,file_hash:str,extension:str)->str:
+        """Sharded location of a content-addressed file, e.g. store/ab/cd/abcd....pdf"""
+        depth=self.app_settings.ASSET_STORE_SHARD_DEPTH
+        shards=[file_hash[i*2:i*2+2] for i in range(depth)]
+        return os.path.join(self.store_dir,*shards,f"{file_hash}.{extension}")
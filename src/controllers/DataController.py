@@ -1,13 +1,13 @@
 import os
 import uuid
+import hashlib
 import aiofiles
+from pymongo.errors import DuplicateKeyError
 from models import AssetModel
 from models.DB_schemas.asset import Asset
 from utils.config import Settings
 from .BaseController import BaseController
 from fastapi import UploadFile
-from .ProjectController import ProjectController
-project_controller=ProjectController()
 class DataController(BaseController):
     def __init__(self):
         super().__init__()
@@ -32,27 +32,54 @@ class DataController(BaseController):
                 "is_valid":is_type_valid and is_size_valid
             }
 
-    def generate_unique_file_name(self, original_file_name: str, project_id: str) -> str:
-        extension = original_file_name.split(".")[-1]
-        unique_id = str(uuid.uuid4())
-        new_file_name = f"{project_id}_{unique_id}.{extension}"
+    def get_file_extension(self,file_name:str)->str:
+        return file_name.split(".")[-1].lower()
+
+    def get_temp_file_path(self)->str:
+        temp_dir=os.path.join(self.store_dir,"tmp")
+        os.makedirs(temp_dir,exist_ok=True)
+        return os.path.join(temp_dir,f"{uuid.uuid4()}.part")
 
-        project_path=project_controller.get_project_asset_path(project_id)
-        file_path = os.path.join(project_path, new_file_name)
-        return file_path,new_file_name
-    
     async def save_and_record_asset(self, file:UploadFile, project_id:str, asset_model:AssetModel, app_settings:Settings):
+        """
+        Streams the upload to disk while hashing it, then files it under its content hash.
+        Returns (asset, is_duplicate); a duplicate reuses the stored file and, within a
+        project, the existing asset record.
+        """
         await file.seek(0)
-        file_path, file_name = self.generate_unique_file_name(file.filename, project_id)
-        async with aiofiles.open(file_path, 'wb') as out_file:
-            while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
-                await out_file.write(chunk)
-        
+        hasher=hashlib.sha256()
+        temp_path=self.get_temp_file_path()
+        try:
+            async with aiofiles.open(temp_path, 'wb') as out_file:
+                while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    await out_file.write(chunk)
+
+            file_hash=hasher.hexdigest()
+            existing_asset=await asset_model.get_asset_by_hash(file_hash=file_hash,project_id=project_id)
+            if existing_asset:
+                return existing_asset, True
+
+            extension=self.get_file_extension(file.filename)
+            file_path=self.get_content_path(file_hash,extension)
+            if not os.path.exists(file_path):
+                os.makedirs(os.path.dirname(file_path),exist_ok=True)
+                os.replace(temp_path,file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
         asset_record = Asset(
             project_id=project_id,
-            name=file_name,
+            name=f"{file_hash}.{extension}",
             type=file.content_type,
             size_in_bytes=os.path.getsize(file_path),
-            url=file_path
+            url=file_path,
+            file_hash=file_hash,
+            metadata={"original_file_name":file.filename}
         )
-        return await asset_model.create_asset(asset_record)
\ No newline at end of file
+        try:
+            return await asset_model.create_asset(asset_record), False
+        except DuplicateKeyError:
+            # the same file raced in through a concurrent upload to this project
+            return await asset_model.get_asset_by_hash(file_hash=file_hash,project_id=project_id), True
@@ -1,73 +1,432 @@
 import os
-from models import Chunk,ChunkModel
+import asyncio
+import hashlib
+from collections import deque
+from datetime import datetime
+from contextlib import aclosing
+from concurrent.futures import Executor
+from typing import AsyncIterator,Optional
+import pymupdf
+import pymupdf4llm
+from bson import ObjectId
+from models import AssetModel,Chunk,ChunkModel
+from stores.parsing import ParsedTextCache
 from .BaseController import BaseController
 from .ProjectController import ProjectController
+from langchain_core.documents import Document
 from langchain_pymupdf4llm import PyMuPDF4LLMLoader 
 from langchain_community.document_loaders import Docx2txtLoader,TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from utils import RecursiveTextSplitter,NearDuplicateDetector
+
+PAGED_EXTENSIONS=["pdf","epub","mobi"]
+# PyMuPDF4LLMLoader's defaults, so windowed parsing matches load_file
+PDF_GRAPHICS_LIMIT=5000
+PDF_PAGE_DELIMITER="\n-----\n\n"
+
+
+def get_loader(file_path:str,extension:str):
+    if extension in PAGED_EXTENSIONS:
+        return PyMuPDF4LLMLoader(file_path)
+    elif extension == "txt":
+        return TextLoader(file_path, encoding="utf-8")
+    elif extension in ["docx"]:
+        return Docx2txtLoader(file_path)
+    else:
+        raise ValueError(f"Unsupported file extension: {extension}")
+
+def load_file(file_path:str,extension:str):
+    """Parse a file into documents. Module level so it can run in a worker process."""
+    return get_loader(file_path,extension).load()
+
+def count_pages(file_path:str,extension:str)->int:
+    """Number of pages load_pages can address; other formats parse as a single page."""
+    if extension not in PAGED_EXTENSIONS:
+        return 1
+    with pymupdf.open(file_path) as doc:
+        return len(doc)
+
+def pdf_metadata(doc:pymupdf.Document,file_path:str)->dict:
+    """Document-level metadata in the shape PyMuPDF4LLMLoader gives every page."""
+    raw={
+        "producer":"PyMuPDF4LLM",
+        "creator":"PyMuPDF4LLM",
+        "creationdate":"",
+        "source":file_path,
+        "file_path":file_path,
+        "total_pages":len(doc),
+    }
+    raw.update({key:value for key,value in doc.metadata.items() if isinstance(value,(str,int))})
+    metadata={}
+    for key,value in raw.items():
+        key=key.lstrip("/").lower()
+        if key in ("creationdate","moddate"):
+            try:
+                value=datetime.strptime(value.replace("'",""),"D:%Y%m%d%H%M%S%z").isoformat("T")
+            except ValueError:
+                pass
+        elif key=="file_path":
+            metadata["source"]=value
+        elif key=="page_count":
+            metadata["total_pages"]=value
+        elif isinstance(value,str):
+            value=value.strip()
+        metadata[key]=value
+    for key in ("modDate","creationDate"):
+        if key in doc.metadata:
+            metadata[key]=doc.metadata[key]
+    return metadata
+
+def load_pages(file_path:str,extension:str,start:int,stop:int)->list[Document]:
+    """
+    Parse pages [start, stop) into the same documents load_file yields for them.
+    Module level so page windows can run in worker processes.
+    """
+    if extension not in PAGED_EXTENSIONS:
+        return load_file(file_path,extension)
+    with pymupdf.open(file_path) as doc:
+        metadata=pdf_metadata(doc,file_path)
+        pages=pymupdf4llm.to_markdown(
+            doc,
+            pages=range(start,min(stop,len(doc))),
+            page_chunks=True,
+            graphics_limit=PDF_GRAPHICS_LIMIT,
+            show_progress=False,
+        )
+    documents=[]
+    for page in pages:
+        text=page["text"]
+        if text.endswith(PDF_PAGE_DELIMITER):
+            text=text[:-len(PDF_PAGE_DELIMITER)]
+        documents.append(Document(page_content=text,metadata=metadata|{"page":page["metadata"]["page"]-1}))
+    return documents
 
 class ProcessController(BaseController):
+    DEDUP_OFF="off"
+    DEDUP_FLAG="flag"
+    DEDUP_COLLAPSE="collapse"
+
     def __init__(self,project_id:str):
         super().__init__()
         self.project_id=project_id
         self.project_path=ProjectController().get_project_asset_path(project_id)
+        self.dedup_mode=self.app_settings.CHUNK_DEDUP_MODE.strip().lower()
+        if self.dedup_mode not in (self.DEDUP_OFF,self.DEDUP_FLAG,self.DEDUP_COLLAPSE):
+            raise ValueError(f"Invalid CHUNK_DEDUP_MODE: '{self.app_settings.CHUNK_DEDUP_MODE}'")
+        # one index per controller, so files processed together are also checked against each other
+        self.duplicate_detector=NearDuplicateDetector(
+            threshold=self.app_settings.CHUNK_DEDUP_THRESHOLD,
+            num_perm=self.app_settings.CHUNK_DEDUP_NUM_PERM,
+            bands=self.app_settings.CHUNK_DEDUP_BANDS
+        )
+        self.duplicates_count=0
+        # ids of originals written by files still in progress: other files must not point at them,
+        # since a failed file's chunks are deleted again
+        self._uncommitted_ids:dict[str,set]={}
+        self._uncommitted_duplicates:dict[str,int]={}
+        self._discarded_ids:set=set()
     def get_file_extension(self,file_id:str)->str:
         return file_id.split(".")[-1]
     
-    def get_loader_by_extension(self,file_id:str):
-        file_path=os.path.join(self.project_path,file_id)
-        extension=self.get_file_extension(file_id)
+    def get_file_path(self,file_id:str)->str:
+        legacy_path=os.path.join(self.project_path,file_id)
+        if os.path.exists(legacy_path):
+            return legacy_path
+        file_hash,extension=file_id.rsplit(".",1)
+        return self.get_content_path(file_hash,extension)
 
-        if extension in ["pdf","epub","mobi"]:
-            return PyMuPDF4LLMLoader(file_path)
-        elif extension == "txt":
-            return TextLoader(file_path, encoding="utf-8")
-        elif extension in ["docx"]:
-            return Docx2txtLoader(file_path)
-        else:
-            raise ValueError(f"Unsupported file extension: {extension}")
+    def get_content_hash(self,file_id:str)->str:
+        legacy_path=os.path.join(self.project_path,file_id)
+        if not os.path.exists(legacy_path):
+            return file_id.rsplit(".",1)[0]
+        # files uploaded before the content-addressed store are named arbitrarily
+        hasher=hashlib.sha256()
+        with open(legacy_path,"rb") as f:
+            while block:=f.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    def get_loader_by_extension(self,file_id:str):
+        return get_loader(self.get_file_path(file_id),self.get_file_extension(file_id))
     def load_document(self,file_id:str):
         loader=self.get_loader_by_extension(file_id)
         return loader.load()
+
+    async def aload_document(self,file_id:str,executor:Optional[Executor]=None):
+        """Parse off the event loop; with a process pool, files parse in parallel across cores."""
+        loop=asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor,
+            load_file,
+            self.get_file_path(file_id),
+            self.get_file_extension(file_id)
+        )
+
+    async def aiter_documents(
+        self,
+        file_id:str,
+        executor:Optional[Executor]=None,
+        parsed_text_cache:Optional[ParsedTextCache]=None
+    )->AsyncIterator[Document]:
+        """
+        Yield a file's documents page by page. Pages are parsed in windows of
+        PARSER_PAGE_WINDOW with the next window parsing while the current one
+        is consumed, so only two windows are ever held in memory. Files of at
+        least PARSER_PARALLEL_MIN_PAGES pages keep PARSER_MAX_WORKERS windows
+        parsing at once, so one large PDF uses every worker; windows are still
+        yielded in page order.
+        With a parsed_text_cache, previously parsed files are read back from it
+        and newly parsed ones are written to it.
+        """
+        loop=asyncio.get_running_loop()
+        file_path=self.get_file_path(file_id)
+        extension=self.get_file_extension(file_id)
+        window=max(1,self.app_settings.PARSER_PAGE_WINDOW)
+
+        writer=None
+        if parsed_text_cache is not None:
+            content_hash=await asyncio.to_thread(self.get_content_hash,file_id)
+            cached_path=parsed_text_cache.lookup(content_hash,extension)
+            if cached_path is not None:
+                batches=parsed_text_cache.iter_batches(cached_path,file_path,batch_size=window)
+                while (documents:=await asyncio.to_thread(next,batches,None)) is not None:
+                    for document in documents:
+                        yield document
+                return
+            writer=await asyncio.to_thread(parsed_text_cache.open_writer,content_hash,extension)
+
+        total_pages=await loop.run_in_executor(executor,count_pages,file_path,extension)
+        windows=[(start,min(start+window,total_pages)) for start in range(0,total_pages,window)]
+
+        in_flight=1
+        # without worker processes windows would share threads, and PyMuPDF is not thread-safe
+        if executor is not None and total_pages>=self.app_settings.PARSER_PARALLEL_MIN_PAGES:
+            in_flight=max(1,self.app_settings.PARSER_MAX_WORKERS)
+
+        pending=deque()
+        def submit(index:int):
+            if index<len(windows):
+                pending.append(loop.run_in_executor(executor,load_pages,file_path,extension,*windows[index]))
+
+        for index in range(in_flight):
+            submit(index)
+        try:
+            for index in range(len(windows)):
+                documents=await pending.popleft()
+                submit(index+in_flight)
+                if writer is not None:
+                    await asyncio.to_thread(writer.write,documents)
+                for document in documents:
+                    yield document
+                del documents
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        else:
+            if writer is not None:
+                await asyncio.to_thread(writer.commit)
+        finally:
+            for future in pending:
+                future.cancel()
+
     def process_document(self,file_content:list,file_id:str,chunk_size:int=600,chunk_overlap:int=200):
+        """Split documents into chunk texts and their metadata (the document's, plus file_id)."""
         if not file_content:
-            return [], [], []
-        text_splitter=RecursiveCharacterTextSplitter(
+            return [], []
+        text_splitter=RecursiveTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            separators=["\n\n","\n"," ",""],
-            length_function=len
+            separators=["\n\n","\n"," ",""]
         )
-        chunks=text_splitter.split_documents(file_content)
-        file_content_texts=[
-            rec.page_content
-            for rec in chunks
-        ]
+        file_content_texts=[]
         file_meta_data=[]
-        for rec in chunks:
-            meta = rec.metadata.copy()
-            meta["file_id"] = file_id
-            file_meta_data.append(meta)
+        for document in file_content:
+            texts=text_splitter.split_text(document.page_content)
+            file_content_texts.extend(texts)
+            file_meta_data.extend({**document.metadata,"file_id":file_id} for _ in texts)
+
+        return file_content_texts, file_meta_data
+
+    async def deduplicate_chunks(self,chunk_model:ChunkModel,chunks:list[Chunk],file_id:str)->list[Chunk]:
+        """
+        Check chunks against the project's earlier chunks (and each other) with
+        MinHash/LSH. Near duplicates get duplicate_of set to the original's id
+        (flag) or are dropped (collapse); originals get their LSH band keys and
+        an id up front so later chunks can point at them. Originals of other
+        files still being processed are ignored until those files complete.
+        """
+        if self.dedup_mode==self.DEDUP_OFF or not chunks:
+            return chunks
+        detector=self.duplicate_detector
+        prepared=[]
+        for chunk in chunks:
+            shingles=detector.shingles(chunk.content)
+            prepared.append((chunk,shingles,detector.band_keys(shingles)))
+
+        band_keys=list({key for _,_,keys in prepared for key in keys})
+        for candidate in await chunk_model.get_chunks_by_band_keys(project_id=self.project_id,band_keys=band_keys):
+            # a lookup can race a failed file's delete and still return its chunks
+            if candidate.id not in detector and candidate.id not in self._discarded_ids:
+                detector.add(candidate.id,detector.shingles(candidate.content),candidate.lsh_bands)
+
+        uncommitted=self._uncommitted_ids.setdefault(file_id,set())
+        in_progress=set().union(*(ids for other_id,ids in self._uncommitted_ids.items() if other_id!=file_id))
+        kept=[]
+        for chunk,shingles,keys in prepared:
+            original_id=detector.find(shingles,keys,exclude=in_progress)
+            if original_id is None:
+                chunk.id=str(ObjectId())
+                chunk.lsh_bands=keys
+                detector.add(chunk.id,shingles,keys)
+                uncommitted.add(chunk.id)
+                kept.append(chunk)
+                continue
+            self._uncommitted_duplicates[file_id]=self._uncommitted_duplicates.get(file_id,0)+1
+            if self.dedup_mode==self.DEDUP_FLAG:
+                chunk.duplicate_of=original_id
+                kept.append(chunk)
+        return kept
+
+    async def write_chunks(self,chunk_model:ChunkModel,chunks:list[Chunk],file_id:str)->int:
+        return await chunk_model.create_chunks_bulk(chunks=await self.deduplicate_chunks(chunk_model,chunks,file_id))
+
+    def commit_file(self,file_id:str):
+        """The file's chunks are final: its originals become valid duplicate targets."""
+        self._uncommitted_ids.pop(file_id,None)
+        self.duplicates_count+=self._uncommitted_duplicates.pop(file_id,0)
 
-        return chunks , file_content_texts, file_meta_data
+    def rollback_file(self,file_id:str):
+        """The file's chunks were deleted: forget its originals."""
+        for chunk_id in self._uncommitted_ids.pop(file_id,set()):
+            self.duplicate_detector.remove(chunk_id)
+            self._discarded_ids.add(chunk_id)
+        self._uncommitted_duplicates.pop(file_id,None)
     
-    async def process_one_file(self,chunk_model:ChunkModel,file_id:str,chunk_size:int=1000,chunk_overlap:int=200):
-        file_content = self.load_document(file_id=file_id)
-        chunks, _, _ = self.process_document(
-            file_content=file_content,
+    async def process_one_file(
+        self,
+        chunk_model:ChunkModel,
+        file_id:str,
+        chunk_size:int=1000,
+        chunk_overlap:int=200,
+        executor:Optional[Executor]=None,
+        parsed_text_cache:Optional[ParsedTextCache]=None,
+        asset_model:Optional[AssetModel]=None
+    ):
+        if asset_model is not None:
+            processed_count = await asset_model.get_processed_count(
+                project_id=self.project_id,
+                name=file_id,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+            if processed_count is not None:
+                return processed_count
+
+        # files processed before completion was recorded on the asset
+        existing_chunks = await chunk_model.get_chunks_by_file_id(
             file_id=file_id,
             chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
-        
-        if chunks is None:
-            return None
-
-        chunks_records = [Chunk(
-            content=chunk.page_content,
-            metadata=chunk.metadata,
-            chunk_order=i + 1,
+            chunk_overlap=chunk_overlap,
             project_id=self.project_id
-        ) for i, chunk in enumerate(chunks)]
-        
-        return await chunk_model.create_chunks_bulk(chunks=chunks_records)
\ No newline at end of file
+        )
+        if existing_chunks:
+            return len(existing_chunks)
+
+        # same content already chunked by another project: copy instead of re-parsing
+        # (not when collapsing, since the other project may have dropped some of its chunks)
+        derived_chunks = []
+        if self.dedup_mode != self.DEDUP_COLLAPSE:
+            derived_chunks = await chunk_model.get_chunks_by_file_id(
+                file_id=file_id,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+        try:
+            if derived_chunks:
+                created = await self._copy_chunks(chunk_model, derived_chunks, file_id)
+            else:
+                created = await self._chunk_file(
+                    chunk_model, file_id, chunk_size, chunk_overlap, executor, parsed_text_cache
+                )
+        except BaseException:
+            # a half-written file would later be mistaken for a fully processed one;
+            # its originals stay hidden from other files until the delete is done
+            try:
+                await chunk_model.delete_chunks_by_file_id(
+                    file_id=file_id,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    project_id=self.project_id
+                )
+            finally:
+                self.rollback_file(file_id)
+            raise
+        self.commit_file(file_id)
+        if asset_model is not None:
+            await asset_model.mark_processed(
+                project_id=self.project_id,
+                name=file_id,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                chunks_count=created
+            )
+        return created
+
+    async def _copy_chunks(self, chunk_model: ChunkModel, derived_chunks: list[Chunk], file_id: str) -> int:
+        # duplicate links point into the other project, so copies are checked again here
+        chunks_records = [
+            chunk.model_copy(update={
+                "id": None, "project_id": self.project_id, "duplicate_of": None, "lsh_bands": None
+            })
+            for chunk in derived_chunks
+        ]
+        flush_size = max(1, self.app_settings.CHUNK_FLUSH_BATCH_SIZE)
+        created = 0
+        for i in range(0, len(chunks_records), flush_size):
+            created += await self.write_chunks(chunk_model, chunks_records[i:i + flush_size], file_id)
+        return created
+
+    async def _chunk_file(
+        self,
+        chunk_model: ChunkModel,
+        file_id: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        executor: Optional[Executor],
+        parsed_text_cache: Optional[ParsedTextCache]
+    ) -> int:
+        # pages are split one at a time (the splitter never crosses documents anyway)
+        # and chunks are flushed in fixed-size batches, so memory does not grow with the file
+        flush_size = max(1, self.app_settings.CHUNK_FLUSH_BATCH_SIZE)
+        chunks_records = []
+        chunk_order = 0
+        created = 0
+        documents = self.aiter_documents(
+            file_id=file_id, executor=executor, parsed_text_cache=parsed_text_cache
+        )
+        # close the generator right away on failure so it can drop its unfinished cache entry
+        async with aclosing(documents):
+            async for document in documents:
+                file_content_texts, file_meta_data = self.process_document(
+                    file_content=[document],
+                    file_id=file_id,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap
+                )
+                for text, meta in zip(file_content_texts, file_meta_data):
+                    chunk_order += 1
+                    chunks_records.append(Chunk(
+                        content=text,
+                        metadata=meta,
+                        chunk_order=chunk_order,
+                        project_id=self.project_id,
+                        chunk_size=chunk_size,
+                        chunk_overlap=chunk_overlap
+                    ))
+                    if len(chunks_records) >= flush_size:
+                        created += await self.write_chunks(chunk_model, chunks_records, file_id)
+                        chunks_records = []
+
+        if chunks_records:
+            created += await self.write_chunks(chunk_model, chunks_records, file_id)
+        return created
\ No newline at end of file
@@ -1,58 +1,461 @@
+import asyncio
+import hashlib
+import uuid
+import numpy as np
+from typing import AsyncIterator, Optional
 from .BaseController import BaseController
 from models import Chunk, Project
+from stores.vectordb import SearchMode, TenancyMode, VectorDBFactory
+from stores.vectordb.VectorDBInterface import SearchResult
+
+POINT_ID_NAMESPACE = uuid.UUID("6f1d8a52-3c1e-4b7a-9f0e-2a5c7d9e1b34")
 
 
 class VectorController(BaseController):
-    def __init__(self, vector_client, embedding_model):
+    def __init__(self, vector_client, embedding_model, search_cache=None):
         super().__init__()
         self.vector_client = vector_client
         self.embedding_model = embedding_model
+        self.search_cache = search_cache
+        self.shared_tenancy = self.app_settings.VECTOR_DB_TENANCY == TenancyMode.SHARED.value
 
-    def create_collection_name(self, project_id: str):
+    def create_project_collection_name(self, project_id: str):
         return f"project_{project_id}".strip()
 
+    def create_collection_name(self, project_id: str):
+        if self.shared_tenancy:
+            return self.app_settings.VECTOR_DB_SHARED_COLLECTION_NAME
+        return self.create_project_collection_name(project_id)
+
+    def create_summary_collection_name(self, project_id: str):
+        return f"{self.create_collection_name(project_id)}_summary"
+
+    def create_summary_point_id(self, project_id: str, file_id: str) -> str:
+        return str(uuid.uuid5(POINT_ID_NAMESPACE, f"summary:{project_id}:{file_id}"))
+
+    def create_tenant_filter(self, project_id: str, filters: Optional[dict] = None):
+        """
+        Scopes operations on the shared collection to one project; per-project collections
+        need no tenant condition. Caller filters are kept but cannot override the tenant.
+        """
+        scoped = dict(filters or {})
+        if self.shared_tenancy:
+            scoped[VectorDBFactory.TENANT_FIELD] = project_id
+        return scoped or None
+
+    async def _embed_documents(self, texts: list[str]) -> np.ndarray:
+        vectors = await self.embedding_model.embed_documents(texts)
+        return self._check_embeddings(vectors, len(texts), "documents")
+
+    async def _embed_queries(self, query_texts: list[str]) -> np.ndarray:
+        query_vectors = await self.embedding_model.embed_queries(query_texts)
+        return self._check_embeddings(query_vectors, len(query_texts), "queries")
+
+    async def _embed_query(self, query_text: str) -> np.ndarray:
+        query_vector = await self.embedding_model.embed_query(query_text)
+        if query_vector is None:
+            raise RuntimeError("Failed to embed query: the embedding provider returned no vector")
+        return query_vector
+
+    @staticmethod
+    def _check_embeddings(vectors, count: int, kind: str):
+        # providers return None when misconfigured; a None or short batch must never reach the vector DB
+        if vectors is None or len(vectors) != count:
+            returned = "no vectors" if vectors is None else f"{len(vectors)} vectors"
+            raise RuntimeError(f"Failed to embed {kind}: the embedding provider returned {returned} for {count} texts")
+        return vectors
+
+    async def invalidate_search_cache(self, project_id: str):
+        """Bumps the project's version so every cached search result for it is bypassed."""
+        if self.search_cache is not None:
+            await self.search_cache.abump_version(project_id)
+
     async def reset_vector_db_collection(self, project_id: str):
         collection_name = self.create_collection_name(project_id)
-        return await self.vector_client.delete_collection(collection_name)
+        summary_name = self.create_summary_collection_name(project_id)
+        try:
+            if self.shared_tenancy:
+                await self.vector_client.delete_by_filter(summary_name, self.create_tenant_filter(project_id))
+                return await self.vector_client.delete_by_filter(collection_name, self.create_tenant_filter(project_id))
+            await self.vector_client.delete_collection(summary_name)
+            return await self.vector_client.delete_collection(collection_name)
+        finally:
+            await self.invalidate_search_cache(project_id)
+
+    def create_point_id(self, chunk: Chunk) -> str:
+        """Stable point id: same chunk with the same content always maps to the same point."""
+        chunk_key = chunk.id or f"{chunk.project_id}:{chunk.chunk_order}"
+        content_hash = hashlib.sha256(chunk.content.encode("utf-8")).hexdigest()
+        return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{chunk_key}:{content_hash}"))
 
-    async def upsert_vectors(self, project: Project, chunks: list[Chunk], do_reset: bool = False):
+    async def upsert_vectors(
+        self,
+        project: Project,
+        chunk_windows: AsyncIterator[list[Chunk]],
+        do_reset: bool = False,
+        do_sync: bool = True,
+    ):
+        """
+        Streams chunk windows through read -> embed -> write stages joined by bounded
+        queues, so window N+1 is embedded while window N is written and memory stays
+        flat. Only chunks whose point is not already in the collection, and that are not
+        flagged near duplicates, are embedded; with do_sync, points that no longer match
+        any chunk are deleted afterwards.
+        """
         collection_name = self.create_collection_name(project.project_id)
-        text_chunks = [chunk.content for chunk in chunks]
-        metadata = [chunk.metadata for chunk in chunks]
-        vectors = await self.embedding_model.embed_documents(text_chunks)
+        tenant_filter = self.create_tenant_filter(project.project_id)
 
         if do_reset:
-            await self.vector_client.delete_collection(collection_name)
+            await self.reset_vector_db_collection(project.project_id)
 
         await self.vector_client.create_collection(
             collection_name=collection_name,
             embedding_dim=self.embedding_model.embedding_dimension,
         )
-        await self.vector_client.upsert_to_collection(
-            collection_name=collection_name,
-            vectors=vectors,
-            metadata=metadata,
-            texts=text_chunks,
+
+        existing_ids = set() if do_reset else await self.vector_client.list_point_ids(
+            collection_name, filters=tenant_filter
+        )
+        seen_ids = set()
+        file_ids, touched_file_ids = set(), set()
+        counts = {"chunks_count": 0, "upserted_count": 0, "duplicates_count": 0}
+        queue_size = self.app_settings.VECTOR_UPSERT_QUEUE_SIZE
+        embed_queue = asyncio.Queue(maxsize=queue_size)
+        write_queue = asyncio.Queue(maxsize=queue_size)
+
+        async def read_stage():
+            async for window in chunk_windows:
+                counts["chunks_count"] += len(window)
+                pending = {}
+                for chunk in window:
+                    # near duplicates flagged at processing time are not embedded;
+                    # with do_sync their points from earlier upserts are removed
+                    if chunk.duplicate_of:
+                        counts["duplicates_count"] += 1
+                        continue
+                    point_id = self.create_point_id(chunk)
+                    if point_id in seen_ids:
+                        continue
+                    seen_ids.add(point_id)
+                    file_ids.add(chunk.metadata.get("file_id"))
+                    if point_id not in existing_ids:
+                        pending[point_id] = chunk
+                        touched_file_ids.add(chunk.metadata.get("file_id"))
+                if pending:
+                    await embed_queue.put(pending)
+            await embed_queue.put(None)
+
+        async def embed_stage():
+            while (pending := await embed_queue.get()) is not None:
+                texts = [chunk.content for chunk in pending.values()]
+                vectors = await self._embed_documents(texts)
+                await write_queue.put((pending, texts, vectors))
+            await write_queue.put(None)
+
+        async def write_stage():
+            while (item := await write_queue.get()) is not None:
+                pending, texts, vectors = item
+                await self.vector_client.upsert_to_collection(
+                    collection_name=collection_name,
+                    vectors=vectors,
+                    metadata=[
+                        dict(chunk.metadata, chunk_id=chunk.id, **{VectorDBFactory.TENANT_FIELD: project.project_id})
+                        for chunk in pending.values()
+                    ],
+                    texts=texts,
+                    ids=list(pending.keys()),
+                )
+                counts["upserted_count"] += len(pending)
+
+        stages = [asyncio.create_task(stage()) for stage in (read_stage, embed_stage, write_stage)]
+        try:
+            try:
+                await asyncio.gather(*stages)
+            except Exception:
+                for stage in stages:
+                    stage.cancel()
+                raise
+
+            stale_ids = list(existing_ids - seen_ids) if do_sync else []
+            if stale_ids:
+                await self.vector_client.delete_points(collection_name, stale_ids)
+
+            if self.app_settings.VECTOR_SUMMARY_ENABLED:
+                # a deleted point's file is unknown without a lookup, so deletions refresh every file
+                counts["summary_count"] = await self.update_summary_vectors(
+                    project, file_ids - {None}, None if stale_ids else touched_file_ids - {None}
+                )
+        finally:
+            # also after a failure: some windows may already have been written
+            await self.invalidate_search_cache(project.project_id)
+
+        return {
+            **counts,
+            "unchanged_count": len(seen_ids) - counts["upserted_count"],
+            "deleted_count": len(stale_ids),
+        }
+
+    async def update_summary_vectors(self, project: Project, file_ids: set, touched_file_ids: Optional[set] = None):
+        """
+        Keeps one summary vector per file, the normalized mean of its normalized chunk
+        vectors, in a companion collection. Files in touched_file_ids (all when None) or
+        without a summary yet are recomputed from their stored chunk vectors; files no
+        longer present are dropped. Returns the number of summaries written.
+        """
+        project_id = project.project_id
+        collection_name = self.create_collection_name(project_id)
+        summary_name = self.create_summary_collection_name(project_id)
+        await self.vector_client.create_collection(
+            collection_name=summary_name,
+            embedding_dim=self.embedding_model.embedding_dimension,
+        )
+
+        summary_ids = {file_id: self.create_summary_point_id(project_id, file_id) for file_id in file_ids}
+        existing_ids = await self.vector_client.list_point_ids(
+            summary_name, filters=self.create_tenant_filter(project_id)
         )
-        return True
+        if touched_file_ids is None:
+            recompute = set(file_ids)
+        else:
+            recompute = {file_id for file_id in file_ids
+                         if file_id in touched_file_ids or summary_ids[file_id] not in existing_ids}
 
-    async def search_vectors(self, project: Project, query_text: str, k: int = 5):
+        sums, counts = {}, {}
+        if recompute:
+            async for _, vectors, payloads in self.vector_client.scroll_points(
+                collection_name,
+                filters=self.create_tenant_filter(project_id, {"file_id": sorted(recompute)}),
+                batch_size=self.app_settings.VECTOR_UPSERT_WINDOW_SIZE,
+            ):
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+                for vector, payload in zip(vectors, payloads):
+                    file_id = payload.get("file_id")
+                    sums[file_id] = sums.get(file_id, 0) + vector
+                    counts[file_id] = counts.get(file_id, 0) + 1
+
+        if sums:
+            summary_files = list(sums.keys())
+            means = np.stack([sums[file_id] / counts[file_id] for file_id in summary_files]).astype(np.float32)
+            means /= np.maximum(np.linalg.norm(means, axis=1, keepdims=True), 1e-12)
+            await self.vector_client.upsert_to_collection(
+                collection_name=summary_name,
+                vectors=means,
+                metadata=[
+                    {"file_id": file_id, "chunks_count": counts[file_id], VectorDBFactory.TENANT_FIELD: project_id}
+                    for file_id in summary_files
+                ],
+                texts=["" for _ in summary_files],
+                ids=[summary_ids[file_id] for file_id in summary_files],
+            )
+
+        stale_ids = existing_ids - set(summary_ids.values())
+        if stale_ids:
+            await self.vector_client.delete_points(summary_name, list(stale_ids))
+        return len(sums)
+
+    async def shortlist_files(self, project: Project, query_vector, n: int, filters: Optional[dict] = None):
+        """
+        First stage of two-stage search: the n files whose summary vectors best match
+        the query. None when the project has no summaries yet.
+        """
+        summary_name = self.create_summary_collection_name(project.project_id)
+        # summaries only carry file_id and the tenant, so only those conditions carry over
+        summary_filters = {
+            field: value for field, value in (filters or {}).items()
+            if field in ("file_id", VectorDBFactory.TENANT_FIELD)
+        }
+        if not await self.vector_client.count_points(summary_name, filters=summary_filters or None):
+            return None
+        results = await self.vector_client.search_collection(
+            collection_name=summary_name,
+            query_vector=query_vector,
+            k=n,
+            filters=summary_filters or None,
+        )
+        return [result.metadata["file_id"] for result in results]
+
+    async def create_search_filters(
+        self, project: Project, query_vector, filters: Optional[dict] = None, shortlist_files: Optional[int] = None
+    ):
+        """Tenant-scoped filters, narrowed to the shortlisted files when two-stage search is requested."""
+        filters = self.create_tenant_filter(project.project_id, filters)
+        if shortlist_files:
+            file_ids = await self.shortlist_files(project, query_vector, shortlist_files, filters)
+            if file_ids is not None:
+                filters = dict(filters or {}, file_id=file_ids)
+        return filters
+
+    async def search_vectors(
+        self,
+        project: Project,
+        query_text: str,
+        k: int = 5,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[dict] = None,
+        shortlist_files: Optional[int] = None,
+    ):
         collection_name = self.create_collection_name(project.project_id)
-        query_vector = await self.embedding_model.embed_query(query_text)
-        return await self.vector_client.search_collection(
+
+        cache_key = None
+        if self.search_cache is not None:
+            version = await self.search_cache.aget_version(project.project_id)
+            cache_key = self.search_cache.make_key(
+                project.project_id, version,
+                collection_name=collection_name,
+                model_id=getattr(self.embedding_model, "embedding_model_id", None),
+                query_text=query_text, k=k, mode=SearchMode(mode).value, exact=exact,
+                filters=filters, shortlist_files=shortlist_files,
+            )
+            cached = await self.search_cache.aget(cache_key)
+            if cached is not None:
+                return [SearchResult(**result) for result in cached]
+
+        query_vector = await self._embed_query(query_text)
+        results = await self.vector_client.search_collection(
             collection_name=collection_name,
             query_vector=query_vector,
             k=k,
+            query_text=query_text,
+            mode=mode,
+            exact=exact,
+            filters=await self.create_search_filters(project, query_vector, filters, shortlist_files),
+        )
+        if cache_key is not None:
+            await self.search_cache.aput(cache_key, [result.model_dump() for result in results])
+        return results
+
+    async def search_vectors_batch(
+        self,
+        project: Project,
+        query_texts: list[str],
+        k: int = 5,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[dict] = None,
+    ):
+        """Embeds all queries in one batched request and runs them as one batch query."""
+        collection_name = self.create_collection_name(project.project_id)
+        query_vectors = await self._embed_queries(query_texts)
+        return await self.vector_client.search_batch(
+            collection_name=collection_name,
+            query_vectors=query_vectors,
+            k=k,
+            query_texts=query_texts,
+            mode=mode,
+            exact=exact,
+            filters=self.create_tenant_filter(project.project_id, filters),
         )
 
+    async def search_vector_groups(
+        self,
+        project: Project,
+        query_text: str,
+        groups: int = 5,
+        group_size: int = 3,
+        group_by: str = "file_id",
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[dict] = None,
+        shortlist_files: Optional[int] = None,
+    ):
+        """
+        Top `groups` distinct candidates (files by default), each with its best chunks.
+        With shortlist_files, only chunks of the best-matching file summaries are searched.
+        """
+        collection_name = self.create_collection_name(project.project_id)
+        query_vector = await self._embed_query(query_text)
+        return await self.vector_client.search_groups(
+            collection_name=collection_name,
+            query_vector=query_vector,
+            group_by=group_by,
+            groups=groups,
+            group_size=group_size,
+            query_text=query_text,
+            mode=mode,
+            exact=exact,
+            filters=await self.create_search_filters(project, query_vector, filters, shortlist_files),
+        )
+
+    async def evaluate_recall(self, project: Project, query_texts: list[str], k: int = 10):
+        """Recall@k of the configured index (HNSW + quantization) against exact search."""
+        collection_name = self.create_collection_name(project.project_id)
+        tenant_filter = self.create_tenant_filter(project.project_id)
+        per_query = []
+        for query_text in query_texts:
+            query_vector = await self._embed_query(query_text)
+            approximate = await self.vector_client.search_collection(
+                collection_name=collection_name, query_vector=query_vector, k=k, filters=tenant_filter
+            )
+            exact = await self.vector_client.search_collection(
+                collection_name=collection_name, query_vector=query_vector, k=k, exact=True,
+                filters=tenant_filter,
+            )
+            exact_ids = {result.id for result in exact}
+            found = sum(1 for result in approximate if result.id in exact_ids)
+            per_query.append(found / len(exact_ids) if exact_ids else 1.0)
+        return {
+            "k": k,
+            "mean_recall": sum(per_query) / len(per_query) if per_query else None,
+            "per_query_recall": per_query,
+        }
+
     async def vector_info(self, project_id: str):
         collection_name = self.create_collection_name(project_id)
-        return await self.vector_client.get_collection_info(collection_name)
+        info = await self.vector_client.get_collection_info(collection_name)
+        if info is not None and self.shared_tenancy:
+            info["tenant"] = project_id
+            info["points_count"] = await self.vector_client.count_points(
+                collection_name, filters=self.create_tenant_filter(project_id)
+            )
+        return info
 
     async def delete_vectors(self, project_id: str):
-        collection_name = self.create_collection_name(project_id)
-        return await self.vector_client.delete_collection(collection_name)
+        return await self.reset_vector_db_collection(project_id)
+
+    async def migrate_to_shared_collection(self, project_id: str, batch_size: int = 256):
+        """
+        Moves a project's legacy per-project collection into the shared collection,
+        reusing the stored vectors and point ids, then drops the old collection.
+        """
+        if not self.shared_tenancy:
+            raise ValueError("Migration requires VECTOR_DB_TENANCY=shared")
+
+        source_name = self.create_project_collection_name(project_id)
+        target_name = self.create_collection_name(project_id)
+        await self.vector_client.create_collection(
+            collection_name=target_name,
+            embedding_dim=self.embedding_model.embedding_dimension,
+        )
+
+        migrated_count = 0
+        async for ids, vectors, payloads in self.vector_client.scroll_points(source_name, batch_size=batch_size):
+            await self.vector_client.upsert_to_collection(
+                collection_name=target_name,
+                vectors=vectors,
+                metadata=[
+                    dict({k: v for k, v in payload.items() if k != "text"},
+                         **{VectorDBFactory.TENANT_FIELD: project_id})
+                    for payload in payloads
+                ],
+                texts=[payload.get("text", "") for payload in payloads],
+                ids=ids,
+            )
+            migrated_count += len(ids)
+
+        await self.vector_client.delete_collection(source_name)
+        # summaries are rebuilt from the migrated chunk vectors on the next upsert
+        await self.vector_client.delete_collection(f"{source_name}_summary")
+        await self.invalidate_search_cache(project_id)
+        return {"migrated_count": migrated_count}
 
     async def delete_vectors_by_ids(self, project_id: str, point_ids: list[str]):
         collection_name = self.create_collection_name(project_id)
-        return await self.vector_client.delete_points(collection_name, point_ids)
\ No newline at end of file
+        try:
+            # ids are not tenant-scoped: the tenant condition keeps other projects' points out of reach
+            return await self.vector_client.delete_points(
+                collection_name, point_ids, filters=self.create_tenant_filter(project_id)
+            )
+        finally:
+            await self.invalidate_search_cache(project_id)
\ No newline at end of file
@@ -4,8 +4,12 @@ from pymongo import AsyncMongoClient
 from utils import get_settings
 from stores import LLMProviderFactory
 from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 from stores import VectorDBFactory
 from routes import vector_router
+from stores.parsing import ParsedTextCache
+from controllers import BaseController
 
 @asynccontextmanager
 async def lifespan(app:FastAPI):
@@ -15,15 +19,32 @@ async def lifespan(app:FastAPI):
 
     app.state.llm_provider_factory=LLMProviderFactory(settings)
     app.state.generation_client=app.state.llm_provider_factory.create(settings.GENERATION_BACKEND)
-    app.state.embedding_client=app.state.llm_provider_factory.create(settings.EMBEDDING_BACKEND)
+    app.state.embedding_client=app.state.llm_provider_factory.create_embedding_client(settings.EMBEDDING_BACKEND)
 
     app.state.vector_db_factory=VectorDBFactory(settings)
     app.state.vector_db=app.state.vector_db_factory.create_vector_db()
     await app.state.vector_db.initialize()
+    app.state.search_cache=app.state.vector_db_factory.create_search_cache()
+
+    app.state.parser_executor=ProcessPoolExecutor(
+        max_workers=settings.PARSER_MAX_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    app.state.parsed_text_cache=None
+    if settings.PARSED_TEXT_CACHE_ENABLED:
+        app.state.parsed_text_cache=ParsedTextCache(
+            directory=BaseController().get_database_path(settings.PARSED_TEXT_CACHE_NAME)
+        )
     try:
         yield
     finally:
         await app.state.mongodb_conn.close()
+        app.state.parser_executor.shutdown(wait=False,cancel_futures=True)
+        app.state.parser_executor=None
+        app.state.parsed_text_cache=None
+        if app.state.search_cache is not None:
+            app.state.search_cache.close()
+        app.state.search_cache=None
         app.state.llm_provider_factory=None
         app.state.generation_client=None
         app.state.embedding_client=None
@@ -42,12 +42,48 @@ class AssetModel(BaseDataModel):
             return Asset(**record)
         return None
     
+    async def get_asset_by_hash(self,file_hash:str,project_id:str=None):
+        query={"file_hash":file_hash}
+        if project_id is not None:
+            query["project_id"]=ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
+        record=await self.collection.find_one(query)
+        if record:
+            return Asset(**record)
+        return None
+
     async def get_assets_by_project_id(self,project_id:str):
         records = await self.collection.find({
             "project_id":ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
         }).to_list(length=None)
         return [Asset(**record) for record in records]
     
+    @staticmethod
+    def get_split_key(chunk_size:int,chunk_overlap:int)->str:
+        return f"{chunk_size}_{chunk_overlap}"
+
+    async def get_processed_count(self,project_id:str,name:str,chunk_size:int,chunk_overlap:int):
+        """Chunks stored when the file was last processed with these split parameters, or None."""
+        key=self.get_split_key(chunk_size,chunk_overlap)
+        record=await self.collection.find_one({
+            "project_id":ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id,
+            "name":name
+        },projection={f"processed_splits.{key}":1})
+        if record is None:
+            return None
+        return (record.get("processed_splits") or {}).get(key)
+
+    async def mark_processed(self,project_id:str,name:str,chunk_size:int,chunk_overlap:int,chunks_count:int):
+        # recorded explicitly: with collapsed duplicates a processed file can store no chunks at all
+        await self.collection.update_one({
+            "project_id":ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id,
+            "name":name
+        },{"$set":{f"processed_splits.{self.get_split_key(chunk_size,chunk_overlap)}":chunks_count}})
+
+    async def clear_processed(self,project_id:str):
+        await self.collection.update_many({
+            "project_id":ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
+        },{"$unset":{"processed_splits":""}})
+
     async def delete_asset_by_id(self,asset_id:str):
         result=await self.collection.delete_one({
             "asset_id":asset_id
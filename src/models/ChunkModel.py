@@ -49,9 +49,56 @@ class ChunkModel(BaseDataModel):
         for i in range(0,len(chunks),batch_size):
             batch=chunks[i:i+batch_size]
             data_batch=[chunk.model_dump(by_alias=True,exclude_none=True) for chunk in batch]
+            for data in data_batch:
+                # ids assigned before insert (so other chunks can reference them) are stored as ObjectIds
+                if "_id" in data and ObjectId.is_valid(data["_id"]):
+                    data["_id"]=ObjectId(data["_id"])
             Operations=[InsertOne(data) for data in data_batch]
             await self.collection.bulk_write(Operations)
         return len(chunks)
+    async def get_chunks_by_file_id(self,file_id:str,chunk_size:int,chunk_overlap:int,project_id:str=None):
+        """
+        Chunks previously derived from a file with the same split parameters.
+        Without a project_id, any project that already processed the file is used.
+        """
+        query={
+            "metadata.file_id":file_id,
+            "chunk_size":chunk_size,
+            "chunk_overlap":chunk_overlap
+        }
+        if project_id is None:
+            record=await self.collection.find_one(query,projection={"project_id":1})
+            if record is None:
+                return []
+            query["project_id"]=record["project_id"]
+        else:
+            query["project_id"]=ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
+        records=await self.collection.find(query).sort("chunk_order",1).to_list(length=None)
+        return [Chunk(**record) for record in records]
+
+    async def get_chunks_by_band_keys(self,project_id:str,band_keys:list[int]):
+        """Non-duplicate chunks of the project sharing at least one LSH band key."""
+        if not band_keys:
+            return []
+        query={
+            "project_id":ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id,
+            "lsh_bands":{"$in":band_keys},
+            "duplicate_of":None
+        }
+        records=await self.collection.find(
+            query,projection={"content":1,"lsh_bands":1,"metadata":1,"chunk_order":1,"project_id":1}
+        ).to_list(length=None)
+        return [Chunk(**record) for record in records]
+
+    async def delete_chunks_by_file_id(self,file_id:str,chunk_size:int,chunk_overlap:int,project_id:str):
+        result=await self.collection.delete_many({
+            "metadata.file_id":file_id,
+            "chunk_size":chunk_size,
+            "chunk_overlap":chunk_overlap,
+            "project_id":ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
+        })
+        return result.deleted_count
+
     async def delete_chunks_by_project_id(self,project_id:str):
         result=await self.collection.delete_many({
             "project_id":ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
@@ -71,3 +118,23 @@ class ChunkModel(BaseDataModel):
             Chunk(**record) 
             for record in records
         ]
+
+    async def count_chunks_by_project_id(self, project_id: str):
+        return await self.count_documents({
+            "project_id": ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
+        })
+
+    async def iter_chunks_by_project_id(self, project_id: str, batch_size: int = 256):
+        """Yields the project's chunks in windows of batch_size straight from the cursor."""
+        query = {
+            "project_id": ObjectId(project_id) if ObjectId.is_valid(project_id) else project_id
+        }
+        cursor = self.collection.find(query).sort("_id", 1).batch_size(batch_size)
+        window = []
+        async for record in cursor:
+            window.append(Chunk(**record))
+            if len(window) >= batch_size:
+                yield window
+                window = []
+        if window:
+            yield window
@@ -10,7 +10,9 @@ class Asset(BaseModel):
     type: str = Field(..., description="Type of the asset (e.g., image, video, document)")
     size_in_bytes: Optional[int] = Field(None, description="Size of the asset in bytes")
     url: str = Field(..., description="URL where the asset is stored")
+    file_hash: Optional[str] = Field(None, description="SHA-256 of the file content, used for deduplication")
     metadata: Optional[dict] = Field(None, description="Additional metadata related to the asset")
+    processed_splits: Optional[dict] = Field(None, description="Chunks stored per completed split, keyed by '<chunk_size>_<chunk_overlap>'")
     created_at: Optional[str] = Field(default_factory=lambda: datetime.now().isoformat(), description="Timestamp when the asset was created")
     updated_at: Optional[str] = Field(default_factory=lambda: datetime.now().isoformat(), description="Timestamp when the asset was last updated")
     model_config: ConfigDict = ConfigDict(
@@ -29,5 +31,10 @@ class Asset(BaseModel):
                 "name":"asset_project_name_id_index",
                 "fields":[("project_id",1),("name",1)],
                 "unique":True
+            },
+            {
+                "name":"asset_file_hash_index",
+                "fields":[("file_hash",1),("project_id",1)],
+                "unique":False
             }
         ]
\ No newline at end of file
@@ -8,6 +8,10 @@ class Chunk(BaseModel):
     metadata: dict
     chunk_order:int =Field(...,gt=0)
     project_id: str=Field(...,min_length=1)
+    chunk_size: Optional[int]=None
+    chunk_overlap: Optional[int]=None
+    lsh_bands: Optional[list[int]]=None
+    duplicate_of: Optional[PyObjectId]=None
     def __str__(self):
         return f"Chunk(id={self.id}, project_id={self.project_id}, content={self.content}, metadata={self.metadata}, chunk_order={self.chunk_order})"
     
@@ -19,4 +23,19 @@ class Chunk(BaseModel):
                 "fields":[("project_id",1)],
                 "unique":False
             },
+            {
+                "name":"chunk_file_id_index",
+                "fields":[("metadata.file_id",1),("chunk_size",1),("chunk_overlap",1)],
+                "unique":False
+            },
+            {
+                "name":"chunk_project_file_id_index",
+                "fields":[("project_id",1),("metadata.file_id",1)],
+                "unique":False
+            },
+            {
+                "name":"chunk_project_lsh_bands_index",
+                "fields":[("project_id",1),("lsh_bands",1)],
+                "unique":False
+            },
         ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter,Depends
+from fastapi import APIRouter,Depends,Request
 from utils import get_settings,Settings
 base_router=APIRouter(
     prefix="/api/v1",
@@ -15,3 +15,17 @@ def welcome(app_settings:Settings=Depends(get_settings)):
         "version": app_version,
         "name": app_name
     }
+
+@base_router.get("/stats")
+def cache_stats(request:Request):
+    embedding_client=request.app.state.embedding_client
+    stats={}
+    if hasattr(embedding_client,"get_stats"):
+        stats.update(embedding_client.get_stats())
+    search_cache=request.app.state.search_cache
+    if search_cache is not None:
+        stats["search_cache"]=search_cache.get_stats()
+    parsed_text_cache=request.app.state.parsed_text_cache
+    if parsed_text_cache is not None:
+        stats["parsed_text_cache"]=parsed_text_cache.get_stats()
+    return stats
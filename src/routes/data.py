@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter,Depends,UploadFile,HTTPException,status,Request
 from fastapi.responses import JSONResponse
 from utils import get_settings,Settings
@@ -30,12 +31,13 @@ async def upload_data(
             raise HTTPException(status_code=400, detail=f"Invalid file: {file.filename}")
 
         try:
-            created_asset = await data_controller.save_and_record_asset(
+            created_asset, is_duplicate = await data_controller.save_and_record_asset(
                 file, project_id, asset_model, app_settings
             )
             uploaded_assets.append({
-                "file_name": created_asset.name,
-                "file_id": created_asset.name
+                "file_name": file.filename,
+                "file_id": created_asset.name,
+                "deduplicated": is_duplicate
             })
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to upload {file.filename}: {str(e)}")
@@ -60,6 +62,7 @@ async def process_data(
     
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
+    asset_model = await AssetModel.create_instance(db_client=db)
     project_files_ids = []
     
     if process_request.file_ids:  
@@ -67,7 +70,6 @@ async def process_data(
     elif process_request.file_id:
         project_files_ids = [process_request.file_id]
     else:                
-        asset_model = await AssetModel.create_instance(db_client=db)
         project_assets = await asset_model.get_assets_by_project_id(project_id=project_id)
         project_files_ids = [str(asset.name) for asset in project_assets]
 
@@ -79,32 +81,38 @@ async def process_data(
     
     if process_request.do_reset:
         await chunk_model.delete_chunks_by_project_id(project_id=project_id)
+        await asset_model.clear_processed(project_id=project_id)
     
     process_controller = ProcessController(project_id=project_id)
     results = []
     errors = []
 
-    for f_id in project_files_ids:
-        try:
-            count = await process_controller.process_one_file(
-                chunk_model=chunk_model,
-                file_id=f_id,
-                chunk_size=process_request.chunk_size,
-                chunk_overlap=process_request.chunk_overlap,
-            )
-            
-            if count is None:
-                errors.append({"file_id": f_id, "error": "Processor returned None"})
-            else:
-                results.append({"file_id": f_id, "chunks_count": count})
-                
-        except Exception as e:
-            errors.append({"file_id": f_id, "error": str(e)})
+    outcomes = await asyncio.gather(*[
+        process_controller.process_one_file(
+            chunk_model=chunk_model,
+            file_id=f_id,
+            chunk_size=process_request.chunk_size,
+            chunk_overlap=process_request.chunk_overlap,
+            executor=request.app.state.parser_executor,
+            parsed_text_cache=request.app.state.parsed_text_cache,
+            asset_model=asset_model,
+        )
+        for f_id in project_files_ids
+    ], return_exceptions=True)
+
+    for f_id, count in zip(project_files_ids, outcomes):
+        if isinstance(count, Exception):
+            errors.append({"file_id": f_id, "error": str(count)})
+        elif count is None:
+            errors.append({"file_id": f_id, "error": "Processor returned None"})
+        else:
+            results.append({"file_id": f_id, "chunks_count": count})
 
     return JSONResponse(
         content={
             "file_count": len(results),
             "total_chunks_count": sum(r["chunks_count"] for r in results),
+            "duplicates_count": process_controller.duplicates_count,
             "errors_count": len(errors),
             "errors": errors,
             "status": "success" if not errors else "partial_success"
@@ -1,2 +1,2 @@
 from .data import ProcessRequest
-from .vectors import UpsertVectorsRequest,SearchVectorsRequest
\ No newline at end of file
+from .vectors import UpsertVectorsRequest,SearchVectorsRequest,SearchVectorsBatchRequest,SearchVectorGroupsRequest,RecallEvaluationRequest
\ No newline at end of file
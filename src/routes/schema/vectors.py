@@ -1,9 +1,41 @@
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Optional, List, Dict, Union
+from pydantic import BaseModel, Field, StrictBool, StrictInt
+from stores.vectordb import SearchMode
+
+# value (exact match), any-of list, or {"gte": 0, "lte": 2} range
+FilterValue = Union[StrictBool, StrictInt, float, str, List[Union[StrictInt, str]], Dict[str, float]]
 
 class UpsertVectorsRequest(BaseModel):
     do_reset: Optional[bool] = False
+    do_sync: Optional[bool] = True
 
 class SearchVectorsRequest(BaseModel):
     query_text: str
-    k: int = 5
\ No newline at end of file
+    k: int = 5
+    mode: SearchMode = SearchMode.DENSE
+    exact: bool = False
+    filters: Optional[Dict[str, FilterValue]] = None
+    # two-stage search: rank chunks of only the N best-matching files
+    shortlist_files: Optional[int] = Field(default=None, ge=1)
+
+class SearchVectorsBatchRequest(BaseModel):
+    query_texts: List[str] = Field(min_length=1)
+    k: int = 5
+    mode: SearchMode = SearchMode.DENSE
+    exact: bool = False
+    filters: Optional[Dict[str, FilterValue]] = None
+
+class SearchVectorGroupsRequest(BaseModel):
+    query_text: str
+    groups: int = Field(default=5, ge=1)
+    group_size: int = Field(default=3, ge=1)
+    group_by: str = "file_id"
+    mode: SearchMode = SearchMode.DENSE
+    exact: bool = False
+    filters: Optional[Dict[str, FilterValue]] = None
+    # two-stage search: rank chunks of only the N best-matching files
+    shortlist_files: Optional[int] = Field(default=None, ge=1)
+
+class RecallEvaluationRequest(BaseModel):
+    query_texts: List[str]
+    k: int = 10
\ No newline at end of file
@@ -2,7 +2,7 @@ from fastapi import APIRouter, status, Request
 from fastapi.responses import JSONResponse
 from controllers import VectorController
 from models import ProjectModel, ChunkModel
-from .schema import UpsertVectorsRequest, SearchVectorsRequest
+from .schema import UpsertVectorsRequest, SearchVectorsRequest, SearchVectorsBatchRequest, SearchVectorGroupsRequest, RecallEvaluationRequest
 import logging
 
 logger = logging.getLogger("uvicorn.error")
@@ -26,6 +26,7 @@ async def upsert_vectors(
         vector_controller = VectorController(
             vector_client=vector_db,
             embedding_model=embedding_client,
+            search_cache=request.app.state.search_cache,
         )
 
         project_model = await ProjectModel.create_instance(
@@ -36,25 +37,29 @@ async def upsert_vectors(
         chunk_model = await ChunkModel.create_instance(
             db_client=request.app.state.db_client
         )
-        project_chunks = await chunk_model.get_chunks_by_project_id(project_id=project_id, page=1, limit=0)
+        chunks_count = await chunk_model.count_chunks_by_project_id(project_id=project_id)
 
-        if not project_chunks:
+        if not chunks_count:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"message": "No chunks found for this project. Process files first."},
             )
 
-        await vector_controller.upsert_vectors(
+        sync_result = await vector_controller.upsert_vectors(
             project=project,
-            chunks=project_chunks,
+            chunk_windows=chunk_model.iter_chunks_by_project_id(
+                project_id=project_id,
+                batch_size=vector_controller.app_settings.VECTOR_UPSERT_WINDOW_SIZE,
+            ),
             do_reset=vector_request.do_reset,
+            do_sync=vector_request.do_sync,
         )
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "message": f"Vectors upserted successfully for project {project_id}",
-                "chunks_count": len(project_chunks),
+                **sync_result,
             },
         )
     except Exception as e:
@@ -76,6 +81,7 @@ async def info_vectors(
         vector_controller = VectorController(
             vector_client=vector_db,
             embedding_model=embedding_client,
+            search_cache=request.app.state.search_cache,
         )
 
         project_model = await ProjectModel.create_instance(
@@ -111,6 +117,7 @@ async def search_vectors(
         vector_controller = VectorController(
             vector_client=vector_db,
             embedding_model=embedding_client,
+            search_cache=request.app.state.search_cache,
         )
 
         project_model = await ProjectModel.create_instance(
@@ -122,6 +129,10 @@ async def search_vectors(
             project=project,
             query_text=search_request.query_text,
             k=search_request.k,
+            mode=search_request.mode,
+            exact=search_request.exact,
+            filters=search_request.filters,
+            shortlist_files=search_request.shortlist_files,
         )
 
         return JSONResponse(
@@ -139,3 +150,172 @@ async def search_vectors(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"message": f"Failed to search vectors: {str(e)}"},
         )
+
+@vector_router.post("/search/batch/{project_id}")
+async def search_vectors_batch(
+    request: Request,
+    project_id: str,
+    search_request: SearchVectorsBatchRequest,
+):
+    try:
+        vector_controller = VectorController(
+            vector_client=request.app.state.vector_db,
+            embedding_model=request.app.state.embedding_client,
+            search_cache=request.app.state.search_cache,
+        )
+
+        project_model = await ProjectModel.create_instance(
+            db_client=request.app.state.db_client
+        )
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        batch_results = await vector_controller.search_vectors_batch(
+            project=project,
+            query_texts=search_request.query_texts,
+            k=search_request.k,
+            mode=search_request.mode,
+            exact=search_request.exact,
+            filters=search_request.filters,
+        )
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={
+                "results": [
+                    {
+                        "query_text": query_text,
+                        "results": [result.model_dump() for result in results],
+                    }
+                    for query_text, results in zip(search_request.query_texts, batch_results)
+                ],
+            },
+        )
+    except Exception as e:
+        logger.error(f"Error batch searching vectors for project {project_id}: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": f"Failed to batch search vectors: {str(e)}"},
+        )
+
+@vector_router.post("/search/groups/{project_id}")
+async def search_vector_groups(
+    request: Request,
+    project_id: str,
+    search_request: SearchVectorGroupsRequest,
+):
+    try:
+        vector_controller = VectorController(
+            vector_client=request.app.state.vector_db,
+            embedding_model=request.app.state.embedding_client,
+            search_cache=request.app.state.search_cache,
+        )
+
+        project_model = await ProjectModel.create_instance(
+            db_client=request.app.state.db_client
+        )
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        groups = await vector_controller.search_vector_groups(
+            project=project,
+            query_text=search_request.query_text,
+            groups=search_request.groups,
+            group_size=search_request.group_size,
+            group_by=search_request.group_by,
+            mode=search_request.mode,
+            exact=search_request.exact,
+            filters=search_request.filters,
+            shortlist_files=search_request.shortlist_files,
+        )
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={
+                "groups": [
+                    group.model_dump()
+                    for group in groups
+                ],
+            },
+        )
+    except Exception as e:
+        logger.error(f"Error searching vector groups for project {project_id}: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": f"Failed to search vector groups: {str(e)}"},
+        )
+
+@vector_router.post("/recall/{project_id}")
+async def evaluate_recall(
+    request: Request,
+    project_id: str,
+    recall_request: RecallEvaluationRequest,
+):
+    try:
+        vector_controller = VectorController(
+            vector_client=request.app.state.vector_db,
+            embedding_model=request.app.state.embedding_client,
+            search_cache=request.app.state.search_cache,
+        )
+
+        project_model = await ProjectModel.create_instance(
+            db_client=request.app.state.db_client
+        )
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        recall = await vector_controller.evaluate_recall(
+            project=project,
+            query_texts=recall_request.query_texts,
+            k=recall_request.k,
+        )
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content=recall,
+        )
+    except Exception as e:
+        logger.error(f"Error evaluating recall for project {project_id}: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": f"Failed to evaluate recall: {str(e)}"},
+        )
+
+@vector_router.post("/migrate/{project_id}")
+async def migrate_vectors(
+    request: Request,
+    project_id: str,
+):
+    try:
+        vector_controller = VectorController(
+            vector_client=request.app.state.vector_db,
+            embedding_model=request.app.state.embedding_client,
+            search_cache=request.app.state.search_cache,
+        )
+
+        if not vector_controller.shared_tenancy:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"message": "Migration requires VECTOR_DB_TENANCY=shared."},
+            )
+
+        project_model = await ProjectModel.create_instance(
+            db_client=request.app.state.db_client
+        )
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        migration = await vector_controller.migrate_to_shared_collection(
+            project_id=project.project_id,
+            batch_size=vector_controller.app_settings.VECTOR_UPSERT_WINDOW_SIZE,
+        )
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={
+                "message": f"Vectors of project {project_id} moved to the shared collection",
+                **migration,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Error migrating vectors for project {project_id}: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": f"Failed to migrate vectors: {str(e)}"},
+        )
@@ -1,5 +1,6 @@
 from .llm import LLMProviderFactory
 from .llm.providers import GeminiProvider
 from .vectordb import VectorDBFactory
-from .vectordb.providers import QdrantdbProvider
-from .llm.LLMInterface import LLMInterface
\ No newline at end of file
+from .vectordb.providers import QdrantdbProvider, NumpyFlatProvider, NumpyIVFPQProvider
+from .llm.LLMInterface import LLMInterface
+from .parsing import ParsedTextCache
\ No newline at end of file
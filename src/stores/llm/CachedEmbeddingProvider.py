@@ -0,0 +1,119 @@
+from typing import Optional, Dict, Any
+import numpy as np
+from .LLMInterface import LLMInterface
+from .LLMConfig import LLMConfig
+from .EmbeddingCache import EmbeddingCache
+from .QueryEmbeddingCache import QueryEmbeddingCache
+
+
+class CachedEmbeddingProvider(LLMInterface):
+    """
+    Wraps any LLMInterface and serves embeddings from an EmbeddingCache.
+    Only texts missing from the cache are sent to the wrapped provider.
+    Query embeddings are also kept in an in-memory QueryEmbeddingCache that
+    coalesces concurrent identical queries into one call.
+    """
+
+    def __init__(
+        self,
+        provider: LLMInterface,
+        cache: Optional[EmbeddingCache] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+    ):
+        self.provider = provider
+        self.cache = cache
+        self.query_cache = query_cache
+
+    def __getattr__(self, name):
+        # expose embedding_dimension, model ids, etc. of the wrapped provider
+        return getattr(self.provider, name)
+
+    def _make_key(self, text: str, task_type: str) -> str:
+        return EmbeddingCache.make_key(
+            model_id=getattr(self.provider, "embedding_model_id", type(self.provider).__name__),
+            dimension=getattr(self.provider, "embedding_dimension", 0),
+            task_type=task_type,
+            text=text,
+        )
+
+    async def generate(self, prompt: str, config: Optional[Dict[str, Any]] = None):
+        return await self.provider.generate(prompt, config)
+
+    async def _embed_many(self, texts: list[str], task_type: str, embed, found: Optional[dict] = None):
+        keys = [self._make_key(text, task_type) for text in texts]
+        cached = dict(found or {})
+        if self.cache is not None:
+            cached.update(await self.cache.aget_many([key for key in keys if key not in cached]))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = await embed(list(missing.values()))
+            if vectors is None or len(vectors) != len(missing):
+                # a partial result cannot be matched back to its texts, so nothing is cached
+                returned = "no vectors" if vectors is None else f"{len(vectors)} vectors"
+                raise RuntimeError(f"Embedding provider returned {returned} for {len(missing)} texts")
+            fresh = dict(zip(missing.keys(), vectors))
+            if self.cache is not None:
+                await self.cache.aput_many(fresh)
+            cached.update(fresh)
+
+        if not keys:
+            return np.empty((0, getattr(self.provider, "embedding_dimension", 0)), dtype=np.float32)
+        return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+
+    async def embed_documents(self, texts: list[str]):
+        return await self._embed_many(texts, LLMConfig.TASK_RETRIEVAL_DOCUMENT, self.provider.embed_documents)
+
+    async def embed_queries(self, texts: list[str]):
+        if self.query_cache is None:
+            return await self._embed_many(texts, LLMConfig.TASK_RETRIEVAL_QUERY, self.provider.embed_queries)
+
+        keys = [self._make_key(text, LLMConfig.TASK_RETRIEVAL_QUERY) for text in texts]
+        found = {}
+        for key in keys:
+            vector = self.query_cache.get(key)
+            if vector is not None:
+                found[key] = vector
+        self.query_cache.hits += len(found)
+        self.query_cache.misses += len(set(keys) - found.keys())
+
+        vectors = await self._embed_many(
+            texts, LLMConfig.TASK_RETRIEVAL_QUERY, self.provider.embed_queries, found=found
+        )
+        for key, vector in zip(keys, vectors):
+            if key not in found:
+                self.query_cache.put(key, vector.copy())
+        return vectors
+
+    async def _embed_query(self, key: str, text: str):
+        if self.cache is not None:
+            cached = await self.cache.aget_many([key])
+            if key in cached:
+                return cached[key].copy()
+
+        vector = await self.provider.embed_query(text)
+        if vector is None:
+            raise RuntimeError("Embedding provider returned no vector for the query")
+        if self.cache is not None:
+            await self.cache.aput_many({key: vector})
+        return vector
+
+    async def embed_query(self, text: str):
+        key = self._make_key(text, LLMConfig.TASK_RETRIEVAL_QUERY)
+        if self.query_cache is None:
+            return await self._embed_query(key, text)
+        vector = await self.query_cache.get_or_compute(key, lambda: self._embed_query(key, text))
+        # callers may modify the returned array; the cached one must stay intact
+        return vector.copy()
+
+    def get_stats(self) -> dict:
+        stats = self.provider.get_stats() if hasattr(self.provider, "get_stats") else {}
+        if self.cache is not None:
+            stats["embedding_cache"] = self.cache.get_stats()
+        if self.query_cache is not None:
+            stats["query_cache"] = self.query_cache.get_stats()
+        return stats
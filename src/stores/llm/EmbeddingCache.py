@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding store (SQLite) with size-bounded LRU eviction.
+
+    Keys combine model id, output dimensionality, task type and a hash of
+    the text, so a model or dimension change never serves stale vectors.
+    The database file can be shared by several worker processes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings(last_access)"
+        )
+        self._conn.commit()
+        self._entries = self._count()
+
+    @staticmethod
+    def make_key(model_id: str, dimension: int, task_type: str, text: str) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model_id}:{dimension}:{task_type}:{text_hash}"
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE embeddings SET last_access=? WHERE key IN ({','.join('?' * len(rows))})",
+                        [now, *[key for key, _ in rows]],
+                    )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]):
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            # only rows that were actually new grow the table; existing keys are refreshed in place
+            inserted = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)", rows
+            ).rowcount
+            if inserted < len(rows):
+                self._conn.executemany(
+                    "UPDATE embeddings SET vector=?, last_access=? WHERE key=?",
+                    [(blob, last_access, key) for key, blob, last_access in rows],
+                )
+            self._entries += inserted
+            if self._entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # other workers may write to the same file, so re-count before deleting
+        self._entries = self._count()
+        overflow = self._entries - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += overflow
+            self._entries -= overflow
+
+    async def aget_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aput_many(self, items: dict[str, np.ndarray]):
+        await asyncio.to_thread(self.put_many, items)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
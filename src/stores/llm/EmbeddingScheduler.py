@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable
+import httpx
+import numpy as np
+from .RateLimitScheduler import RateLimitScheduler
+
+
+class EmbeddingScheduler:
+    """
+    Splits embedding inputs into request-sized batches and runs them
+    concurrently under a semaphore. Each batch is written into its rows of
+    one preallocated float32 matrix, so output order matches input order.
+
+    Transport errors, timeouts and 5xx responses are retried with exponential
+    backoff; anything else (bad input, a provider bug) fails at once. Rate
+    limits (429) are left to the RateLimitScheduler wrapping the provider
+    call, so a 429 is never retried by both layers. When the provider rejects
+    a request as too large (413) the batch size is halved and the failed range
+    is re-split; successful batches grow it back gradually (AIMD). Overload
+    (503) says nothing about size, so it is retried at the same batch size.
+    """
+
+    PUSHBACK_CODES = {413}
+    PUSHBACK_MARKERS = ("too large", "exceeds the limit")
+    TRANSPORT_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError, httpx.TransportError)
+
+    def __init__(
+        self,
+        max_batch_size: int = 100,
+        max_batch_chars: int = 80000,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_size = max_batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _error_code(error: Exception):
+        code = getattr(error, "code", None) or getattr(error, "status_code", None)
+        return code if isinstance(code, int) else None
+
+    def is_pushback(self, error: Exception) -> bool:
+        if self._error_code(error) in self.PUSHBACK_CODES:
+            return True
+        message = str(error)
+        return any(marker in message for marker in self.PUSHBACK_MARKERS)
+
+    def is_retryable(self, error: Exception) -> bool:
+        if RateLimitScheduler.is_rate_limited(error):
+            return False
+        code = self._error_code(error)
+        if code is None:
+            return isinstance(error, self.TRANSPORT_ERRORS) or self.is_pushback(error)
+        return code >= 500 or code in (408, 413)
+
+    def plan_batches(self, texts: list[str], start: int = 0, end: int = None) -> list[tuple[int, int]]:
+        end = len(texts) if end is None else end
+        batches = []
+        batch_start, batch_chars = start, 0
+        for i in range(start, end):
+            size = len(texts[i])
+            if i > batch_start and (
+                i - batch_start >= self.batch_size or batch_chars + size > self.max_batch_chars
+            ):
+                batches.append((batch_start, i))
+                batch_start, batch_chars = i, 0
+            batch_chars += size
+        if batch_start < end:
+            batches.append((batch_start, end))
+        return batches
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _shrink(self, failed_size: int):
+        self.batch_size = max(1, min(self.batch_size, failed_size // 2))
+
+    def _grow(self):
+        if self.batch_size < self.max_batch_size:
+            self.batch_size = min(self.max_batch_size, self.batch_size + max(1, self.batch_size // 4))
+
+    async def run(
+        self,
+        texts: list[str],
+        embed_batch: Callable[[list[str]], Awaitable[np.ndarray]],
+        dimension: int,
+    ) -> np.ndarray:
+        results = np.empty((len(texts), dimension), dtype=np.float32)
+        await self._run_ranges(texts, self.plan_batches(texts), embed_batch, results, attempt=0)
+        return results
+
+    async def _run_ranges(self, texts, ranges, embed_batch, results: np.ndarray, attempt: int):
+        tasks = [
+            asyncio.create_task(self._run_batch(texts, start, end, embed_batch, results, attempt))
+            for start, end in ranges
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _run_batch(self, texts, start: int, end: int, embed_batch, results: np.ndarray, attempt: int):
+        try:
+            async with self._semaphore:
+                vectors = await embed_batch(texts[start:end])
+            if len(vectors) != end - start:
+                raise ValueError(f"Provider returned {len(vectors)} embeddings for {end - start} inputs")
+        except Exception as e:
+            if attempt >= self.max_retries or not self.is_retryable(e):
+                raise
+            if self.is_pushback(e):
+                self._shrink(end - start)
+            delay = self._backoff(attempt)
+            self.logger.warning(
+                f"Embedding batch [{start}:{end}] failed ({e}); retrying in {delay:.1f}s "
+                f"with batch size {self.batch_size}"
+            )
+            await asyncio.sleep(delay)
+            await self._run_ranges(
+                texts, self.plan_batches(texts, start, end), embed_batch, results, attempt + 1
+            )
+            return
+
+        results[start:end] = vectors
+        self._grow()
@@ -4,6 +4,7 @@ class LLMConfig:
     # ── Provider Identifiers ─────────────────────────────────────
     PROVIDER_GEMINI = "gemini"
     PROVIDER_GROQ = "groq"
+    PROVIDER_HASHING = "hashing"     # offline, deterministic embeddings only
 
     # ── Default Model Settings ───────────────────────────────────
     DEFAULT_GEMINI_MODEL: str = "gemini-3-pro-preview"
@@ -11,6 +12,10 @@ class LLMConfig:
     DEFAULT_EMBEDDING_MODEL: str = "gemini-embedding-001"
     DEFAULT_EMBEDDING_DIMENSION: int = 768
 
+    # ── Embedding Task Types ─────────────────────────────────────
+    TASK_RETRIEVAL_DOCUMENT: str = "RETRIEVAL_DOCUMENT"
+    TASK_RETRIEVAL_QUERY: str = "RETRIEVAL_QUERY"
+
     # ── Groq Model Catalog ───────────────────────────────────────
     GROQ_MODELS: dict[str, str] = {
         "llama-3.1-8b": "llama-3.1-8b-instant",         # Speed
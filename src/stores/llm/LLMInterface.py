@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Dict,Optional,Any
+import numpy as np
 
 class LLMInterface(ABC):
     @abstractmethod
@@ -14,6 +15,7 @@ class LLMInterface(ABC):
     async def embed_documents(self,texts:list[str]):
         """
         Embeds a list of texts for storage (Database).
+        Returns a contiguous float32 matrix of shape (len(texts), dim), rows L2-normalized.
         """
         pass
     
@@ -21,5 +23,21 @@ class LLMInterface(ABC):
     async def embed_query(self,text:str):
         """
         Embeds a single query for searching (Retrieval).
+        Returns an L2-normalized float32 vector.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def embed_queries(self,texts:list[str]):
+        """
+        Embeds many queries in as few requests as possible.
+        Returns a float32 matrix of shape (len(texts), dim), rows L2-normalized.
+        """
+        pass
+
+    @staticmethod
+    def normalize_embeddings(vectors:np.ndarray)->np.ndarray:
+        """L2-normalizes rows in place with a single vectorized pass."""
+        norms=np.linalg.norm(vectors,axis=-1,keepdims=True)
+        np.divide(vectors,norms,out=vectors,where=norms>0)
+        return vectors
\ No newline at end of file
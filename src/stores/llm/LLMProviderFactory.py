@@ -1,10 +1,19 @@
+import os
 from .providers.GeminiProvider import GeminiProvider
+from .providers.HashingEmbeddingProvider import HashingEmbeddingProvider
 from .LLMConfig import LLMConfig
+from .EmbeddingCache import EmbeddingCache
+from .EmbeddingScheduler import EmbeddingScheduler
+from .RateLimitScheduler import RateLimitScheduler
+from .CachedEmbeddingProvider import CachedEmbeddingProvider
+from .QueryEmbeddingCache import QueryEmbeddingCache
+from controllers.BaseController import BaseController
 
 
 class LLMProviderFactory:
     def __init__(self, config):
         self.config = config
+        self._rate_limiter = None
 
     def create(self, provider: str):
         provider_key = provider.strip().lower()
@@ -15,6 +24,15 @@ class LLMProviderFactory:
                 api_key=self.config.GEMINI_API_KEY,
                 embedding_model_id=self.config.EMBEDDING_MODEL_ID,
                 embedding_dimension=self.config.EMBEDDING_MODEL_SIZE,
+                embedding_scheduler=self.create_embedding_scheduler(),
+                query_scheduler=self.create_embedding_scheduler(),
+                rate_limiter=self.get_rate_limiter(),
+            )
+        elif provider_key == LLMConfig.PROVIDER_HASHING:
+            return HashingEmbeddingProvider(
+                embedding_dimension=self.config.EMBEDDING_MODEL_SIZE,
+                latency_ms=self.config.HASHING_EMBEDDING_LATENCY_MS,
+                embedding_scheduler=self.create_embedding_scheduler(),
             )
         elif provider_key == LLMConfig.PROVIDER_GROQ:
             raise NotImplementedError(f"Groq provider is not implemented yet")
@@ -25,4 +43,46 @@ class LLMProviderFactory:
             #     embedding_dimension=self.config.EMBEDDING_MODEL_SIZE,
             # )
         else:
-            raise ValueError(f"Invalid LLM provider: '{provider}'")
\ No newline at end of file
+            raise ValueError(f"Invalid LLM provider: '{provider}'")
+
+    def create_embedding_scheduler(self) -> EmbeddingScheduler:
+        return EmbeddingScheduler(
+            max_batch_size=self.config.EMBEDDING_BATCH_SIZE,
+            max_batch_chars=self.config.EMBEDDING_BATCH_MAX_CHARS,
+            max_concurrency=self.config.EMBEDDING_MAX_CONCURRENCY,
+            max_retries=self.config.EMBEDDING_MAX_RETRIES,
+            base_delay=self.config.EMBEDDING_RETRY_BASE_DELAY,
+        )
+
+    def get_rate_limiter(self) -> RateLimitScheduler:
+        """One scheduler for every client this factory creates, since they draw on the same quota."""
+        if self._rate_limiter is None:
+            self._rate_limiter = RateLimitScheduler(
+                requests_per_minute=self.config.GEMINI_REQUESTS_PER_MINUTE,
+                tokens_per_minute=self.config.GEMINI_TOKENS_PER_MINUTE,
+                max_retries=self.config.GEMINI_RATE_LIMIT_MAX_RETRIES,
+                base_delay=self.config.EMBEDDING_RETRY_BASE_DELAY,
+                max_delay=self.config.GEMINI_RATE_LIMIT_MAX_DELAY,
+            )
+        return self._rate_limiter
+
+    def create_embedding_client(self, provider: str):
+        client = self.create(provider)
+        if not self.config.EMBEDDING_CACHE_ENABLED and not self.config.QUERY_CACHE_ENABLED:
+            return client
+
+        cache = None
+        if self.config.EMBEDDING_CACHE_ENABLED:
+            cache_dir = BaseController().get_database_path(self.config.EMBEDDING_CACHE_NAME)
+            cache = EmbeddingCache(
+                path=os.path.join(cache_dir, "embeddings.sqlite3"),
+                max_entries=self.config.EMBEDDING_CACHE_MAX_ENTRIES,
+            )
+
+        query_cache = None
+        if self.config.QUERY_CACHE_ENABLED:
+            query_cache = QueryEmbeddingCache(
+                max_entries=self.config.QUERY_CACHE_MAX_ENTRIES,
+                ttl_seconds=self.config.QUERY_CACHE_TTL_SECONDS,
+            )
+        return CachedEmbeddingProvider(provider=client, cache=cache, query_cache=query_cache)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+import numpy as np
+
+
+class QueryEmbeddingCache:
+    """
+    In-process TTL + LRU cache for query embeddings with single-flight loading.
+
+    Concurrent lookups of the same missing key share one in-flight computation
+    instead of each calling the embedding API. Entries expire after ttl_seconds
+    and the least recently used ones are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._entries: "OrderedDict[str, tuple[float, np.ndarray]]" = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, vector = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def put(self, key: str, vector: np.ndarray):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[np.ndarray]]) -> np.ndarray:
+        """Returns the cached vector, joins an in-flight computation, or runs compute() once."""
+        vector = self.get(key)
+        if vector is not None:
+            self.hits += 1
+            return vector
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # the leading request was cancelled, not this one: compute it ourselves
+                if in_flight.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.get_or_compute(key, compute)
+                raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            vector = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # waiters re-raise it; mark it retrieved for the case nobody was waiting
+            future.exception()
+            raise
+        else:
+            if vector is not None:
+                self.put(key, vector)
+            future.set_result(vector)
+            return vector
+        finally:
+            self._in_flight.pop(key, None)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else None,
+        }
@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import re
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Continuously refilling budget of `per_minute` units; per_minute <= 0 means unlimited."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    def refill(self, now: float):
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def clamp(self, amount: float) -> float:
+        # a single request larger than the whole budget can still run, once the bucket is full
+        return amount if self.unlimited else min(amount, self.capacity)
+
+    def wait_time(self, amount: float) -> float:
+        if self.unlimited or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self._rate
+
+    def consume(self, amount: float):
+        if not self.unlimited:
+            self.level -= amount
+
+
+class RateLimitScheduler:
+    """
+    Admits provider API calls within requests-per-minute and tokens-per-minute
+    budgets, shared by every provider instance that holds it.
+
+    Waiting calls are admitted strictly by priority, then arrival, so an
+    interactive query embedding overtakes queued bulk document batches. A 429
+    pauses admission for everyone (the quota is shared) for the delay the API
+    suggests, or an exponential backoff, and the call is retried.
+    """
+
+    PRIORITY_QUERY = 0
+    PRIORITY_GENERATION = 1
+    PRIORITY_DOCUMENT = 2
+
+    CHARS_PER_TOKEN = 4
+    RATE_LIMIT_MARKERS = ("RESOURCE_EXHAUSTED", "rate limit")
+    RETRY_DELAY_PATTERN = re.compile(r"retry(?:Delay| in)['\"]?:?\s*['\"]?(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.admitted = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+        self._waiting: list[tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def estimate_tokens(cls, texts) -> int:
+        if isinstance(texts, str):
+            texts = [texts]
+        return max(1, sum(len(text) for text in texts) // cls.CHARS_PER_TOKEN)
+
+    @classmethod
+    def is_rate_limited(cls, error: Exception) -> bool:
+        code = getattr(error, "code", None) or getattr(error, "status_code", None)
+        if code == 429:
+            return True
+        message = str(error)
+        return any(marker in message for marker in cls.RATE_LIMIT_MARKERS)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        match = self.RETRY_DELAY_PATTERN.search(str(error))
+        if match:
+            return min(self.max_delay, float(match.group(1)))
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    # --- Admission ---
+
+    async def acquire(self, tokens: int = 1, priority: int = PRIORITY_DOCUMENT):
+        """Waits until one request of `tokens` tokens fits the budgets and nothing more urgent is queued."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), self.tokens.clamp(tokens), future))
+        started = time.monotonic()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # a cancelled head must not block the calls queued behind it
+            self._dispatch()
+            raise
+        self.waited_seconds += time.monotonic() - started
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        while self._waiting:
+            _, _, tokens, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            wait = max(self._paused_until - now, self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiting)
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self.admitted += 1
+            future.set_result(None)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        tokens: int = 1,
+        priority: int = PRIORITY_DOCUMENT,
+    ) -> T:
+        """Runs call() once admitted, retrying it after a shared pause whenever it is rate limited."""
+        attempt = 0
+        while True:
+            await self.acquire(tokens, priority)
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= self.max_retries or not self.is_rate_limited(e):
+                    raise
+                delay = self._retry_delay(e, attempt)
+                attempt += 1
+                self.throttled += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                self.logger.warning(f"Rate limited ({e}); pausing all calls for {delay:.1f}s")
+
+    def get_stats(self) -> dict:
+        return {
+            "requests_per_minute": self.requests.per_minute,
+            "tokens_per_minute": self.tokens.per_minute,
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "waiting": sum(1 for *_, future in self._waiting if not future.done()),
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
@@ -1,2 +1,7 @@
 from .LLMProviderFactory import LLMProviderFactory
-from .providers import GeminiProvider
\ No newline at end of file
+from .providers import GeminiProvider, HashingEmbeddingProvider
+from .EmbeddingCache import EmbeddingCache
+from .CachedEmbeddingProvider import CachedEmbeddingProvider
+from .QueryEmbeddingCache import QueryEmbeddingCache
+from .EmbeddingScheduler import EmbeddingScheduler
+from .RateLimitScheduler import RateLimitScheduler
\ No newline at end of file
@@ -2,6 +2,9 @@ from typing import Optional, Dict, Any
 from google import genai
 from google.genai import types
 from ..LLMInterface import LLMInterface
+from ..LLMConfig import LLMConfig
+from ..EmbeddingScheduler import EmbeddingScheduler
+from ..RateLimitScheduler import RateLimitScheduler
 import logging
 import numpy as np
 
@@ -10,12 +13,19 @@ class GeminiProvider(LLMInterface):
         api_key: str, 
         model_id: str = "gemini-2.0-flash",
         embedding_model_id: str = "gemini-embedding-001",
-        embedding_dimension: int = 768
+        embedding_dimension: int = 768,
+        embedding_scheduler: Optional[EmbeddingScheduler] = None,
+        query_scheduler: Optional[EmbeddingScheduler] = None,
+        rate_limiter: Optional[RateLimitScheduler] = None
      ):
         self.api_key = api_key
         self.model_id = model_id 
         self.embedding_model_id=embedding_model_id
         self.embedding_dimension=embedding_dimension
+        self.embedding_scheduler=embedding_scheduler or EmbeddingScheduler()
+        # queries get their own concurrency slots so bulk ingest cannot hold them all
+        self.query_scheduler=query_scheduler or EmbeddingScheduler()
+        self.rate_limiter=rate_limiter or RateLimitScheduler()
 
         if not self.api_key:
             raise ValueError("Google API key is required")
@@ -46,18 +56,56 @@ class GeminiProvider(LLMInterface):
         generation_config = types.GenerateContentConfig(**final_config_dict)
 
         try:
-            response = await self.client.aio.models.generate_content(
-                model=self.model_id,
-                contents=prompt,
-                config=generation_config
+            response = await self.rate_limiter.run(
+                lambda: self.client.aio.models.generate_content(
+                    model=self.model_id,
+                    contents=prompt,
+                    config=generation_config
+                ),
+                tokens=RateLimitScheduler.estimate_tokens(prompt),
+                priority=RateLimitScheduler.PRIORITY_GENERATION,
             )
             
             return response.text
             
         except Exception as e:
-            print(f"Gemini Error: {e}") 
+            self.logger.error(f"Generation Error: {e}")
             raise RuntimeError(f"Failed to generate content: {str(e)}")
         
+    async def _embed_content(self, contents, config: types.EmbedContentConfig, priority: int):
+        return await self.rate_limiter.run(
+            lambda: self.client.aio.models.embed_content(
+                model=self.embedding_model_id,
+                contents=contents,
+                config=config
+            ),
+            tokens=RateLimitScheduler.estimate_tokens(contents),
+            priority=priority,
+        )
+
+    async def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        response = await self._embed_content(
+            texts,
+            types.EmbedContentConfig(
+                task_type=LLMConfig.TASK_RETRIEVAL_DOCUMENT, 
+                title="Resume Snippet",
+                output_dimensionality=self.embedding_dimension
+            ),
+            priority=RateLimitScheduler.PRIORITY_DOCUMENT,
+        )
+        return np.asarray([emb.values for emb in response.embeddings], dtype=np.float32)
+
+    async def _embed_query_batch(self, texts: list[str]) -> np.ndarray:
+        response = await self._embed_content(
+            texts,
+            types.EmbedContentConfig(
+                task_type=LLMConfig.TASK_RETRIEVAL_QUERY,
+                output_dimensionality=self.embedding_dimension
+            ),
+            priority=RateLimitScheduler.PRIORITY_QUERY,
+        )
+        return np.asarray([emb.values for emb in response.embeddings], dtype=np.float32)
+
     async def embed_documents(self, texts):
         if not self.client:
             self.logger.error("genai client was not set")
@@ -65,47 +113,45 @@ class GeminiProvider(LLMInterface):
         if not self.embedding_model_id:
             self.logger.error("embedding model was not set")
             return None
+        if not texts:
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
         try:
-            response = await self.client.aio.models.embed_content(
-                model=self.embedding_model_id,
-                contents=texts,
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_DOCUMENT", 
-                    title="Resume Snippet",
-                    output_dimensionality=self.embedding_dimension
-                )
+            vectors = await self.embedding_scheduler.run(
+                texts, self._embed_batch, dimension=self.embedding_dimension
             )
-            
-            embeddings = []
-            for emb in response.embeddings:
-                v = np.array(emb.values)
-                norm = np.linalg.norm(v)
-                if norm > 0:
-                    v = v / norm
-                embeddings.append(v.tolist())
-                
-            return embeddings
+            return self.normalize_embeddings(vectors)
         except Exception as e:
-            print(f"Embedding Doc Error: {e}")
-            return []
+            self.logger.error(f"Embedding Doc Error: {e}")
+            raise RuntimeError(f"Failed to embed documents: {str(e)}")
 
     async def embed_query(self, text):
         try:
-            response = await self.client.aio.models.embed_content(
-                model=self.embedding_model_id,
-                contents=text,
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_QUERY",
+            response = await self._embed_content(
+                text,
+                types.EmbedContentConfig(
+                    task_type=LLMConfig.TASK_RETRIEVAL_QUERY,
                     output_dimensionality=self.embedding_dimension
-                )
+                ),
+                priority=RateLimitScheduler.PRIORITY_QUERY,
             )
             
-            v = np.array(response.embeddings[0].values)
-            norm = np.linalg.norm(v)
-            if norm > 0:
-                v = v / norm
-                
-            return v.tolist()
+            v = np.asarray(response.embeddings[0].values, dtype=np.float32)
+            return self.normalize_embeddings(v)
         except Exception as e:
             self.logger.error(f"Embedding Query Error: {e}")
-            raise RuntimeError(f"Failed to embed query: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to embed query: {str(e)}")
+
+    async def embed_queries(self, texts):
+        if not texts:
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
+        try:
+            vectors = await self.query_scheduler.run(
+                texts, self._embed_query_batch, dimension=self.embedding_dimension
+            )
+            return self.normalize_embeddings(vectors)
+        except Exception as e:
+            self.logger.error(f"Embedding Queries Error: {e}")
+            raise RuntimeError(f"Failed to embed queries: {str(e)}")
+
+    def get_stats(self) -> dict:
+        return {"rate_limit": self.rate_limiter.get_stats()}
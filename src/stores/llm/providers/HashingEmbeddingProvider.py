@@ -0,0 +1,109 @@
+from typing import Optional, Dict, Any
+from ..LLMInterface import LLMInterface
+from ..EmbeddingScheduler import EmbeddingScheduler
+import asyncio
+import functools
+import logging
+import re
+import zlib
+import numpy as np
+
+
+class HashingEmbeddingProvider(LLMInterface):
+    """
+    Offline, deterministic embeddings by feature hashing.
+
+    Word n-grams and character n-grams of each word are hashed (crc32) into
+    `embedding_dimension` signed buckets, weighted by sublinear term frequency
+    and L2-normalized. The same text always yields the same vector, on any
+    machine, with no network access. Texts sharing vocabulary get similar
+    vectors, which is enough to exercise ingest and search end to end.
+    latency_ms adds an artificial delay per embed request to mimic a remote API.
+    It cannot generate text: use it as EMBEDDING_BACKEND only, with
+    GENERATION_BACKEND pointing at a real model.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+    MODEL_VERSION = "hashing-v1"
+
+    def __init__(
+        self,
+        embedding_dimension: int = 768,
+        word_ngrams: tuple[int, int] = (1, 2),
+        char_ngrams: tuple[int, int] = (3, 5),
+        latency_ms: float = 0.0,
+        embedding_scheduler: Optional[EmbeddingScheduler] = None,
+    ):
+        self.embedding_dimension = embedding_dimension
+        self.embedding_model_id = f"{self.MODEL_VERSION}-w{word_ngrams[0]}{word_ngrams[1]}-c{char_ngrams[0]}{char_ngrams[1]}"
+        self.word_ngrams = word_ngrams
+        self.char_ngrams = char_ngrams
+        self.latency_ms = latency_ms
+        self.embedding_scheduler = embedding_scheduler or EmbeddingScheduler()
+        self.logger = logging.getLogger(__name__)
+        # vocabularies repeat heavily across resumes: hash each word's features once
+        self._word_hashes = functools.lru_cache(maxsize=200000)(self._hash_word)
+
+    async def generate(self, prompt: str, config: Optional[Dict[str, Any]] = None):
+        raise ValueError(
+            "The HASHING backend only provides embeddings; set GENERATION_BACKEND to a generation model (e.g. GEMINI)"
+        )
+
+    @staticmethod
+    def _hash(feature: str) -> int:
+        return zlib.crc32(feature.encode("utf-8"))
+
+    def _hash_word(self, word: str) -> tuple[int, ...]:
+        """Hashes of the word as a unigram (if enabled) and of its character n-grams."""
+        hashes = [self._hash(word)] if self.word_ngrams[0] <= 1 <= self.word_ngrams[1] else []
+        marked = f"<{word}>"
+        low, high = self.char_ngrams
+        for n in range(low, high + 1):
+            # "#" keeps char n-grams from colliding with identical words
+            hashes.extend(self._hash("#" + marked[i:i + n]) for i in range(len(marked) - n + 1))
+        return tuple(hashes)
+
+    def _text_hashes(self, text: str) -> list[int]:
+        words = self.TOKEN_PATTERN.findall(text.lower())
+        hashes = []
+        for word in words:
+            hashes.extend(self._word_hashes(word))
+        low, high = self.word_ngrams
+        for n in range(max(low, 2), high + 1):
+            hashes.extend(self._hash(" ".join(words[i:i + n])) for i in range(len(words) - n + 1))
+        return hashes
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embeds texts into an L2-normalized float32 matrix; one bincount builds the whole batch."""
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            text_hashes = self._text_hashes(text)
+            hashes.extend(text_hashes)
+            rows.extend([row] * len(text_hashes))
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        columns = (hashes % self.embedding_dimension).astype(np.int64)
+        # the top hash bit picks the sign, so collisions tend to cancel instead of pile up
+        signs = np.where(hashes >> 31 & 1, -1.0, 1.0)
+        flat_index = np.asarray(rows, dtype=np.int64) * self.embedding_dimension + columns
+        counts = np.bincount(flat_index, weights=signs, minlength=len(texts) * self.embedding_dimension)
+
+        vectors = counts.reshape(len(texts), self.embedding_dimension)
+        vectors = (np.sign(vectors) * np.log1p(np.abs(vectors))).astype(np.float32)
+        return self.normalize_embeddings(vectors)
+
+    async def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return await asyncio.to_thread(self.encode, texts)
+
+    async def embed_documents(self, texts):
+        if not texts:
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
+        return await self.embedding_scheduler.run(texts, self._embed_batch, dimension=self.embedding_dimension)
+
+    async def embed_queries(self, texts):
+        return await self.embed_documents(texts)
+
+    async def embed_query(self, text):
+        return (await self.embed_documents([text]))[0]
@@ -1 +1,2 @@
 from .GeminiProvider import GeminiProvider
+from .HashingEmbeddingProvider import HashingEmbeddingProvider
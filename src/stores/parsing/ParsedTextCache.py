@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import json
+import os
+from importlib.metadata import PackageNotFoundError, version
+from typing import Iterator, Optional
+from langchain_core.documents import Document
+
+
+class ParsedTextCache:
+    """
+    On-disk cache of parsed documents (page text + loader metadata).
+
+    Entries are gzip-compressed JSONL files, one document per line, keyed by
+    the file's content hash and the version of the loader that produced them,
+    so re-chunking a file with new split parameters skips parsing entirely and
+    upgrading a parser package never serves stale text. Entries are written
+    to a temp file and renamed into place once complete, so a crashed or
+    concurrent parse never leaves a truncated entry behind.
+    """
+
+    FORMAT_VERSION = 1
+    # packages whose output defines the parsed text, per file extension
+    LOADER_PACKAGES = {
+        "pdf": ("langchain-pymupdf4llm", "pymupdf4llm", "pymupdf"),
+        "epub": ("langchain-pymupdf4llm", "pymupdf4llm", "pymupdf"),
+        "mobi": ("langchain-pymupdf4llm", "pymupdf4llm", "pymupdf"),
+        "docx": ("langchain-community", "docx2txt"),
+        "txt": ("langchain-community",),
+    }
+    # metadata that points at wherever the file was parsed from, not at its content
+    PATH_METADATA_KEYS = ("source", "file_path")
+
+    def __init__(self, directory: str, compress_level: int = 6):
+        self.directory = directory
+        self.compress_level = compress_level
+        self.hits = 0
+        self.misses = 0
+        self._loader_versions: dict[str, str] = {}
+
+    def get_loader_version(self, extension: str) -> str:
+        if extension not in self._loader_versions:
+            parts = [f"format={self.FORMAT_VERSION}", f"extension={extension}"]
+            for package in self.LOADER_PACKAGES.get(extension, ()):
+                try:
+                    parts.append(f"{package}={version(package)}")
+                except PackageNotFoundError:
+                    parts.append(f"{package}=missing")
+            self._loader_versions[extension] = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+        return self._loader_versions[extension]
+
+    def get_path(self, content_hash: str, extension: str) -> str:
+        loader_version = self.get_loader_version(extension)
+        return os.path.join(
+            self.directory, content_hash[:2], f"{content_hash}.{extension}.{loader_version}.jsonl.gz"
+        )
+
+    def lookup(self, content_hash: str, extension: str) -> Optional[str]:
+        """Path of the cached entry, or None on a miss."""
+        path = self.get_path(content_hash, extension)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def iter_batches(self, path: str, file_path: str, batch_size: int = 8) -> Iterator[list[Document]]:
+        """Reads an entry back in batches of documents, re-pointing path metadata at file_path."""
+        batch = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                metadata = record["metadata"]
+                for key in self.PATH_METADATA_KEYS:
+                    if key in metadata:
+                        metadata[key] = file_path
+                batch.append(Document(page_content=record["page_content"], metadata=metadata))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def open_writer(self, content_hash: str, extension: str) -> "ParsedTextWriter":
+        return ParsedTextWriter(self.get_path(content_hash, extension), self.compress_level)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ParsedTextWriter:
+    """Appends documents to a temp file that becomes the cache entry on commit()."""
+
+    def __init__(self, path: str, compress_level: int = 6):
+        self.path = path
+        self.temp_path = f"{path}.{os.getpid()}.{id(self)}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = gzip.open(self.temp_path, "wt", encoding="utf-8", compresslevel=compress_level)
+
+    def write(self, documents: list[Document]):
+        for document in documents:
+            self._file.write(json.dumps(
+                {"page_content": document.page_content, "metadata": document.metadata},
+                ensure_ascii=False,
+                default=str,
+            ))
+            self._file.write("\n")
+
+    def commit(self):
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
@@ -0,0 +1 @@
+from .ParsedTextCache import ParsedTextCache, ParsedTextWriter
@@ -0,0 +1,51 @@
+import re
+import zlib
+from collections import Counter
+from typing import List, Tuple
+
+SparseVectorData = Tuple[List[int], List[float]]
+
+
+class BM25Encoder:
+    """
+    Encodes text into hashed sparse term vectors for keyword retrieval.
+
+    Documents carry the BM25 term-frequency component; the IDF component is
+    applied by the vector database over the whole collection, so the encoder
+    needs no corpus statistics and new chunks can be indexed independently.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w[\w+#]*")
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_length: float = 100.0):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+
+    def tokenize(self, text: str) -> List[str]:
+        return self.TOKEN_PATTERN.findall(text.lower())
+
+    @staticmethod
+    def token_index(token: str) -> int:
+        return zlib.crc32(token.encode("utf-8"))
+
+    def _term_frequencies(self, tokens: List[str]) -> Counter:
+        # hash collisions merge counts instead of producing duplicate indices
+        return Counter(self.token_index(token) for token in tokens)
+
+    def encode_document(self, text: str) -> SparseVectorData:
+        tokens = self.tokenize(text)
+        if not tokens:
+            return [], []
+        length_norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_doc_length)
+        frequencies = self._term_frequencies(tokens)
+        indices = list(frequencies.keys())
+        values = [tf * (self.k1 + 1) / (tf + length_norm) for tf in frequencies.values()]
+        return indices, values
+
+    def encode_documents(self, texts: List[str]) -> List[SparseVectorData]:
+        return [self.encode_document(text) for text in texts]
+
+    def encode_query(self, text: str) -> SparseVectorData:
+        indices = list(self._term_frequencies(self.tokenize(text)).keys())
+        return indices, [1.0] * len(indices)
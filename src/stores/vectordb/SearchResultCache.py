@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class SearchResultCache:
+    """
+    Size-bounded cache of search results with per-project version invalidation.
+
+    Every key embeds the project's current version; mutating a project bumps
+    the version, so older results can never be served again and simply age
+    out of the LRU. With path=None entries and versions live in this process
+    only, which is correct for a single worker. With a SQLite path both are
+    shared by all workers on the host.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._conn = None
+        self._size = 0
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results(last_access)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS versions (project_id TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+            self._size = self._count()
+
+    @staticmethod
+    def make_key(project_id: str, version: int, **params) -> str:
+        params_hash = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{project_id}:{version}:{params_hash}"
+
+    # --- Versions ---
+
+    def get_version(self, project_id: str) -> int:
+        with self._lock:
+            if self._conn is None:
+                return self._versions.get(project_id, 0)
+            row = self._conn.execute(
+                "SELECT version FROM versions WHERE project_id=?", (project_id,)
+            ).fetchone()
+            return row[0] if row else 0
+
+    def bump_version(self, project_id: str) -> int:
+        with self._lock:
+            if self._conn is None:
+                self._versions[project_id] = self._versions.get(project_id, 0) + 1
+                return self._versions[project_id]
+            self._conn.execute(
+                "INSERT INTO versions (project_id, version) VALUES (?, 1) "
+                "ON CONFLICT(project_id) DO UPDATE SET version=version+1",
+                (project_id,),
+            )
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT version FROM versions WHERE project_id=?", (project_id,)
+            ).fetchone()[0]
+
+    # --- Entries ---
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if self._conn is None:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+            else:
+                row = self._conn.execute("SELECT value FROM results WHERE key=?", (key,)).fetchone()
+                value = json.loads(row[0]) if row else None
+                if row:
+                    self._conn.execute("UPDATE results SET last_access=? WHERE key=?", (time.time(), key))
+                    self._conn.commit()
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        """Stores a JSON-serializable value."""
+        with self._lock:
+            if self._conn is None:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+                return
+            row = (key, json.dumps(value), time.time())
+            # only a new key grows the table; an existing one is refreshed in place
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO results (key, value, last_access) VALUES (?, ?, ?)", row
+            ).rowcount
+            if not inserted:
+                self._conn.execute("UPDATE results SET value=?, last_access=? WHERE key=?", (row[1], row[2], key))
+            self._size += inserted
+            if self._size > self.max_entries:
+                # other workers write to the same file, so re-count before deleting
+                self._size = self._count()
+                overflow = self._size - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM results WHERE key IN "
+                        "(SELECT key FROM results ORDER BY last_access LIMIT ?)",
+                        (overflow,),
+                    )
+                    self.evictions += overflow
+                    self._size -= overflow
+            self._conn.commit()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    # SQLite calls block, so the async variants run them off the event loop
+
+    async def aget_version(self, project_id: str) -> int:
+        if self._conn is None:
+            return self.get_version(project_id)
+        return await asyncio.to_thread(self.get_version, project_id)
+
+    async def abump_version(self, project_id: str) -> int:
+        if self._conn is None:
+            return self.bump_version(project_id)
+        return await asyncio.to_thread(self.bump_version, project_id)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        if self._conn is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: Any):
+        if self._conn is None:
+            return self.put(key, value)
+        await asyncio.to_thread(self.put, key, value)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = len(self._entries) if self._conn is None else self._size
+        return {
+            "backend": "memory" if self._conn is None else "sqlite",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "max_entries": self.max_entries,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
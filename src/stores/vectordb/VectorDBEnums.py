@@ -1,11 +1,13 @@
 from enum import Enum
-from typing import Optional
+from typing import Optional, Dict
 from pydantic import BaseModel
 
 
 class VectorDBEnum(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    NUMPY_FLAT = "NUMPY_FLAT"
+    NUMPY_IVFPQ = "NUMPY_IVFPQ"
 
 
 class DistanceMetric(Enum):
@@ -15,6 +17,22 @@ class DistanceMetric(Enum):
     MANHATTAN = "manhattan"
 
 
+class SearchMode(Enum):
+    DENSE = "dense"
+    HYBRID = "hybrid"
+
+
+class QuantizationType(Enum):
+    NONE = "none"
+    SCALAR = "scalar"   # int8, ~4x smaller
+    BINARY = "binary"   # 1 bit per dimension, ~32x smaller
+
+
+class TenancyMode(Enum):
+    COLLECTION = "collection"   # one collection per project
+    SHARED = "shared"           # all projects in one collection, partitioned by payload
+
+
 class VectorDBConfig(BaseModel):
     """
     Typed configuration for a vector database connection.
@@ -28,6 +46,29 @@ class VectorDBConfig(BaseModel):
         collection_name: Name of the collection to store vectors in.
         embedding_dim:   Dimensionality of the embedding vectors.
         distance:        Distance metric for similarity search.
+        quantization:    Compressed in-RAM copy of the vectors (QuantizationType
+                         values); originals are kept for rescoring.
+        quantization_always_ram: Keep quantized vectors in RAM even when the
+                         originals are on disk.
+        on_disk_vectors: Store original float32 vectors on disk (memmapped).
+        hnsw_m / hnsw_ef_construct: HNSW graph degree and build-time beam
+                         width; None keeps the server default.
+        search_hnsw_ef:  Search-time beam width; None keeps the default.
+        search_rescore:  Rescore quantized candidates with original vectors.
+        search_oversampling: Fetch k * oversampling quantized candidates
+                         before rescoring.
+        ivf_nlist / ivf_nprobe: Coarse clusters of the NUMPY_IVFPQ index and
+                         how many of them a search visits.
+        pq_m:            Bytes of PQ code per vector (sub-quantizers).
+        ivf_train_size / ivf_min_train_points: Training sample size, and the
+                         collection size below which search stays flat.
+        ivf_rerank_factor: Rescore k * factor PQ candidates against the
+                         on-disk originals; 0 disables reranking and 1
+                         rescores just the top k exactly.
+        tenant_field:    Payload field partitioning a shared multi-tenant
+                         collection; indexed tenant-first when set.
+        payload_indexes: Payload field -> index type ("keyword", "integer",
+                         "float", "bool") for fields used in search filters.
     """
     path: str
     api_key: Optional[str] = None
@@ -35,3 +76,19 @@ class VectorDBConfig(BaseModel):
     collection_name: str
     embedding_dim: int
     distance: str = "cosine"
+    quantization: str = QuantizationType.NONE.value
+    quantization_always_ram: bool = True
+    on_disk_vectors: bool = False
+    hnsw_m: Optional[int] = None
+    hnsw_ef_construct: Optional[int] = None
+    search_hnsw_ef: Optional[int] = None
+    search_rescore: bool = True
+    search_oversampling: Optional[float] = None
+    ivf_nlist: int = 1024
+    ivf_nprobe: int = 16
+    pq_m: int = 64
+    ivf_train_size: int = 65536
+    ivf_min_train_points: int = 20000
+    ivf_rerank_factor: int = 0
+    tenant_field: Optional[str] = None
+    payload_indexes: Dict[str, str] = {}
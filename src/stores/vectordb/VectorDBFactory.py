@@ -1,10 +1,16 @@
-from .VectorDBEnums import VectorDBEnum, VectorDBConfig
+from .VectorDBEnums import VectorDBEnum, VectorDBConfig, TenancyMode
 from .VectorDBInterface import VectorDBInterface
 from .providers.QdrantdbProvider import QdrantdbProvider
-from controllers import BaseController
+from .providers.NumpyFlatProvider import NumpyFlatProvider
+from .providers.NumpyIVFPQProvider import NumpyIVFPQProvider
+from .SearchResultCache import SearchResultCache
+from controllers.BaseController import BaseController
+import os
 
 
 class VectorDBFactory:
+    TENANT_FIELD = "project_id"
+
     def __init__(self, config):
         self.config = config
         self.base_controller = BaseController()
@@ -16,9 +22,41 @@ class VectorDBFactory:
             collection_name=self.config.VECTOR_DB_COLLECTION_NAME,
             embedding_dim=self.config.EMBEDDING_MODEL_SIZE,
             distance=self.config.VECTOR_DB_DISTANCE,
+            quantization=self.config.VECTOR_DB_QUANTIZATION,
+            quantization_always_ram=self.config.VECTOR_DB_QUANTIZATION_ALWAYS_RAM,
+            on_disk_vectors=self.config.VECTOR_DB_ON_DISK_VECTORS,
+            hnsw_m=self.config.VECTOR_DB_HNSW_M,
+            hnsw_ef_construct=self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+            search_hnsw_ef=self.config.VECTOR_DB_SEARCH_HNSW_EF,
+            search_rescore=self.config.VECTOR_DB_SEARCH_RESCORE,
+            search_oversampling=self.config.VECTOR_DB_SEARCH_OVERSAMPLING,
+            ivf_nlist=self.config.VECTOR_DB_IVF_NLIST,
+            ivf_nprobe=self.config.VECTOR_DB_IVF_NPROBE,
+            pq_m=self.config.VECTOR_DB_PQ_M,
+            ivf_train_size=self.config.VECTOR_DB_IVF_TRAIN_SIZE,
+            ivf_min_train_points=self.config.VECTOR_DB_IVF_MIN_TRAIN_POINTS,
+            ivf_rerank_factor=self.config.VECTOR_DB_IVF_RERANK_FACTOR,
+            tenant_field=(
+                self.TENANT_FIELD
+                if self.config.VECTOR_DB_TENANCY == TenancyMode.SHARED.value else None
+            ),
+            payload_indexes=self.config.VECTOR_DB_PAYLOAD_INDEXES,
         )
 
         if db_config.vector_db_type == VectorDBEnum.QDRANT.value:
             return QdrantdbProvider(db_config)
+        elif db_config.vector_db_type == VectorDBEnum.NUMPY_FLAT.value:
+            return NumpyFlatProvider(db_config)
+        elif db_config.vector_db_type == VectorDBEnum.NUMPY_IVFPQ.value:
+            return NumpyIVFPQProvider(db_config)
         else:
-            raise ValueError(f"Unsupported vector database type: {db_config.vector_db_type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported vector database type: {db_config.vector_db_type}")
+
+    def create_search_cache(self):
+        if not self.config.SEARCH_CACHE_ENABLED:
+            return None
+        path = None
+        if self.config.SEARCH_CACHE_BACKEND == "sqlite":
+            cache_dir = self.base_controller.get_database_path(self.config.SEARCH_CACHE_NAME)
+            path = os.path.join(cache_dir, "search_results.sqlite3")
+        return SearchResultCache(path=path, max_entries=self.config.SEARCH_CACHE_MAX_ENTRIES)
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, AsyncIterator, Tuple
 from pydantic import BaseModel
+import numpy as np
+from .VectorDBEnums import SearchMode
 
 class SearchResult(BaseModel):
     id: str
@@ -8,7 +10,15 @@ class SearchResult(BaseModel):
     content: str
     metadata: Dict[str, Any]
 
+class SearchGroup(BaseModel):
+    id: str
+    hits: List[SearchResult]
+
 class VectorDBInterface(ABC):
+    # filters map payload fields to a value (exact match), a list (match any)
+    # or a dict of these operators (numeric range)
+    RANGE_OPERATORS = {"gt", "gte", "lt", "lte"}
+
     @abstractmethod
     async def upsert(self, documents: List[Dict[str, Any]]):
         """
@@ -50,24 +60,100 @@ class VectorDBInterface(ABC):
     async def upsert_to_collection(
         self,
         collection_name: str,
-        vectors: List[List[float]],
+        vectors: np.ndarray,
         metadata: List[Dict[str, Any]],
         texts: List[str],
+        ids: Optional[List[str]] = None,
     ):
-        """Upsert pre-embedded vectors into a specific collection."""
+        """
+        Upsert pre-embedded vectors (a float32 matrix, one row per text) into a specific collection.
+        Points with an existing id are overwritten; without ids, random ones are generated.
+        """
+        pass
+
+    @abstractmethod
+    async def list_point_ids(self, collection_name: str, filters: Optional[Dict[str, Any]] = None) -> Set[str]:
+        """Return the ids of all points in a collection matching filters (empty if it does not exist)."""
+        pass
+
+    @abstractmethod
+    async def count_points(self, collection_name: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Exact number of points in a collection matching filters."""
+        pass
+
+    @abstractmethod
+    def scroll_points(
+        self,
+        collection_name: str,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256,
+    ) -> AsyncIterator[Tuple[List[str], np.ndarray, List[Dict[str, Any]]]]:
+        """
+        Iterate over stored points as (ids, dense vectors, payloads) batches.
+        Payloads include the point text under "text".
+        """
         pass
 
     @abstractmethod
     async def search_collection(
         self,
         collection_name: str,
-        query_vector: List[float],
+        query_vector: np.ndarray,
         k: int = 5,
+        query_text: Optional[str] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
-        """Search a specific collection by vector similarity."""
+        """
+        Search a specific collection by vector similarity.
+        In hybrid mode, query_text also drives a keyword (BM25) retrieval fused with the dense ranking.
+        exact=True bypasses the approximate index, giving ground truth for recall checks.
+        filters restrict the search to points matching every condition, e.g.
+        {"file_id": ["a.pdf", "b.pdf"], "page": {"lte": 2}}.
+        """
+        pass
+
+    @abstractmethod
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: np.ndarray,
+        k: int = 5,
+        query_texts: Optional[List[str]] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        """Runs one search per row of query_vectors in a single call; results are in query order."""
+        pass
+
+    @abstractmethod
+    async def search_groups(
+        self,
+        collection_name: str,
+        query_vector: np.ndarray,
+        group_by: str,
+        groups: int = 5,
+        group_size: int = 3,
+        query_text: Optional[str] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchGroup]:
+        """
+        Search grouped by a payload field (e.g. file_id): the best `groups` distinct values,
+        each with up to `group_size` of its best hits, in one query.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_points(self, collection_name: str, point_ids: List[str],
+                            filters: Optional[Dict[str, Any]] = None):
+        """Delete specific points from a collection; with filters, only those that also match them."""
         pass
 
     @abstractmethod
-    async def delete_points(self, collection_name: str, point_ids: List[str]):
-        """Delete specific points from a collection."""
+    async def delete_by_filter(self, collection_name: str, filters: Dict[str, Any]):
+        """Delete every point matching filters."""
         pass
\ No newline at end of file
@@ -1,3 +1,5 @@
 from .VectorDBFactory import VectorDBFactory
-from .VectorDBEnums import VectorDBEnum, DistanceMetric, VectorDBConfig
+from .VectorDBEnums import VectorDBEnum, DistanceMetric, VectorDBConfig, SearchMode, QuantizationType, TenancyMode
 from .VectorDBInterface import VectorDBInterface
+from .BM25Encoder import BM25Encoder
+from .SearchResultCache import SearchResultCache
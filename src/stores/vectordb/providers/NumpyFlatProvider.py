@@ -0,0 +1,537 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import uuid
+import numpy as np
+from typing import List, Dict, Any, Optional, Set, AsyncIterator, Tuple
+from ..VectorDBInterface import VectorDBInterface, SearchResult, SearchGroup
+from ..VectorDBEnums import DistanceMetric, VectorDBConfig, SearchMode
+
+
+class FlatCollection:
+    """
+    In-memory view of one collection: memory-mapped vectors plus row-aligned ids and payloads.
+    `generation` names the data files in use; `index` is an optional approximate index over
+    the same rows, which providers that keep one must carry over to every new view.
+    """
+
+    def __init__(self, path: str, dim: int, distance: str, ids: List[str], payloads: List[dict],
+                 generation: int = 0, index: Any = None):
+        self.path = path
+        self.dim = dim
+        self.distance = DistanceMetric(distance)
+        self.ids = ids
+        self.payloads = payloads
+        self.generation = generation
+        self.index = index
+        self.id_to_row = {point_id: row for row, point_id in enumerate(ids)}
+        self.vectors = self._open_vectors()
+        self._payload_indexes: Dict[str, Dict[Any, np.ndarray]] = {}
+        self._numeric_columns: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def file_name(stem: str, extension: str, generation: int) -> str:
+        # generation 0 keeps the original names, so existing collections load unchanged
+        return f"{stem}.{extension}" if generation == 0 else f"{stem}.{generation}.{extension}"
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.path, self.file_name("vectors", "f32", self.generation))
+
+    @property
+    def payloads_path(self) -> str:
+        return os.path.join(self.path, self.file_name("payloads", "jsonl", self.generation))
+
+    def _open_vectors(self) -> np.ndarray:
+        if not self.ids:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.ids), self.dim))
+
+    def payload_index(self, field: str) -> Dict[Any, np.ndarray]:
+        """Rows per value of a payload field, built on first use (collections are never mutated in place)."""
+        if field not in self._payload_indexes:
+            rows: Dict[Any, list] = {}
+            for row, payload in enumerate(self.payloads):
+                value = payload.get(field)
+                if isinstance(value, (str, int, float, bool)):
+                    rows.setdefault(value, []).append(row)
+            self._payload_indexes[field] = {value: np.array(r, dtype=np.int64) for value, r in rows.items()}
+        return self._payload_indexes[field]
+
+    def numeric_column(self, field: str) -> np.ndarray:
+        """Float values of a payload field for range filters; NaN where missing or non-numeric."""
+        if field not in self._numeric_columns:
+            self._numeric_columns[field] = np.array([
+                value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+                for value in (payload.get(field) for payload in self.payloads)
+            ], dtype=np.float64)
+        return self._numeric_columns[field]
+
+
+class NumpyFlatProvider(VectorDBInterface):
+    """
+    Exact, in-process vector search for small collections.
+
+    Each collection is a directory holding an append-only float32 matrix
+    (vectors.f32, memory-mapped for search), a row-aligned payloads.jsonl and
+    meta.json, whose row count is the commit point for appends. Deletes and
+    overwrites write the kept rows as a new generation of both files, and the
+    meta.json write that names the new generation is the only commit point,
+    so a crash leaves either the old or the new files in use. Rows or
+    generations left behind by an interrupted write are cleaned up on load,
+    which runs under the collection lock like every write. Search is one
+    matmul plus argpartition over the memory-mapped matrix.
+    """
+
+    ROOT_DIRECTORY = "numpy_flat"
+    GROUP_CANDIDATE_FACTOR = 4
+
+    def __init__(self, config: VectorDBConfig):
+        self.root = os.path.join(config.path, self.ROOT_DIRECTORY)
+        os.makedirs(self.root, exist_ok=True)
+        self.collection_name = config.collection_name
+        self.embedding_dim = config.embedding_dim
+        self.distance = DistanceMetric(config.distance)
+
+        self._collections: Dict[str, FlatCollection] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.logger = logging.getLogger(__name__)
+
+    # --- Storage helpers ---
+
+    def _collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.root, collection_name)
+
+    def _lock(self, collection_name: str) -> asyncio.Lock:
+        return self._locks.setdefault(collection_name, asyncio.Lock())
+
+    def _exists(self, collection_name: str) -> bool:
+        return os.path.exists(os.path.join(self._collection_path(collection_name), "meta.json"))
+
+    def _read_meta(self, path: str) -> dict:
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self, path: str, meta: dict):
+        temp_path = os.path.join(path, "meta.json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, os.path.join(path, "meta.json"))
+
+    def _remove_stale_files(self, path: str, generation: int):
+        """Deletes data files of other generations and temp files left by interrupted writes."""
+        current = {FlatCollection.file_name(stem, extension, generation)
+                   for stem, extension in (("vectors", "f32"), ("payloads", "jsonl"))}
+        for name in os.listdir(path):
+            stale_data = name.startswith(("vectors.", "payloads.")) and name not in current
+            if stale_data or name.endswith(".tmp"):
+                os.remove(os.path.join(path, name))
+
+    def _load(self, collection_name: str) -> Optional[FlatCollection]:
+        """Cached view of a collection, reading (and repairing) it from disk on first use; call under the lock."""
+        if collection_name in self._collections:
+            return self._collections[collection_name]
+        if not self._exists(collection_name):
+            return None
+
+        path = self._collection_path(collection_name)
+        meta = self._read_meta(path)
+        generation = meta.get("generation", 0)
+        payloads_path = os.path.join(path, FlatCollection.file_name("payloads", "jsonl", generation))
+        vectors_path = os.path.join(path, FlatCollection.file_name("vectors", "f32", generation))
+        ids, payloads = [], []
+        committed_bytes = 0
+        with open(payloads_path, "rb") as f:
+            for line in f:
+                if len(ids) == meta["count"]:
+                    break
+                point_id, payload = json.loads(line)
+                ids.append(point_id)
+                payloads.append(payload)
+                committed_bytes += len(line)
+
+        # rows past meta["count"] belong to an interrupted append; cut them off before appending again
+        if os.path.getsize(payloads_path) > committed_bytes:
+            os.truncate(payloads_path, committed_bytes)
+        if os.path.getsize(vectors_path) > len(ids) * meta["dim"] * 4:
+            os.truncate(vectors_path, len(ids) * meta["dim"] * 4)
+        self._remove_stale_files(path, generation)
+
+        collection = FlatCollection(path, meta["dim"], meta["distance"], ids, payloads, generation)
+        self._collections[collection_name] = collection
+        return collection
+
+    async def _get_collection(self, collection_name: str) -> Optional[FlatCollection]:
+        """Collection for a read; a cold load can repair files, so it takes the collection lock."""
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            async with self._lock(collection_name):
+                collection = await asyncio.to_thread(self._load, collection_name)
+        return collection
+
+    def _prepare_vectors(self, vectors: np.ndarray, distance: DistanceMetric) -> np.ndarray:
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        if distance == DistanceMetric.COSINE:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def _append(self, collection: FlatCollection, ids: List[str], vectors: np.ndarray, payloads: List[dict]) -> FlatCollection:
+        with open(collection.vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(collection.payloads_path, "a", encoding="utf-8") as f:
+            for point_id, payload in zip(ids, payloads):
+                f.write(json.dumps([point_id, payload]) + "\n")
+
+        all_ids = collection.ids + ids
+        self._write_meta(collection.path, {
+            "dim": collection.dim, "distance": collection.distance.value,
+            "count": len(all_ids), "generation": collection.generation,
+        })
+        return FlatCollection(collection.path, collection.dim, collection.distance.value,
+                              all_ids, collection.payloads + payloads, collection.generation)
+
+    def _compact(self, collection: FlatCollection, keep_rows: np.ndarray) -> FlatCollection:
+        """Writes keep_rows as the next generation of the data files; the meta.json write switches to it."""
+        vectors = np.asarray(collection.vectors[keep_rows], dtype=np.float32)
+        ids = [collection.ids[row] for row in keep_rows]
+        payloads = [collection.payloads[row] for row in keep_rows]
+
+        compacted = FlatCollection(collection.path, collection.dim, collection.distance.value,
+                                   [], [], collection.generation + 1)
+        with open(compacted.vectors_path, "wb") as f:
+            f.write(vectors.tobytes())
+        with open(compacted.payloads_path, "w", encoding="utf-8") as f:
+            for point_id, payload in zip(ids, payloads):
+                f.write(json.dumps([point_id, payload]) + "\n")
+        self._write_meta(collection.path, {
+            "dim": collection.dim, "distance": collection.distance.value,
+            "count": len(ids), "generation": compacted.generation,
+        })
+        # open views keep their memory maps of the old files until they are dropped
+        self._remove_stale_files(collection.path, compacted.generation)
+        return FlatCollection(collection.path, collection.dim, collection.distance.value,
+                              ids, payloads, compacted.generation)
+
+    RANGE_COMPARATORS = {"gt": np.greater, "gte": np.greater_equal, "lt": np.less, "lte": np.less_equal}
+
+    def _condition_mask(self, collection: FlatCollection, field: str, value: Any) -> np.ndarray:
+        if isinstance(value, dict):
+            unknown = set(value) - self.RANGE_OPERATORS
+            if unknown:
+                raise ValueError(f"Unsupported range operators for '{field}': {sorted(unknown)}")
+            column = collection.numeric_column(field)
+            mask = ~np.isnan(column)
+            for operator, bound in value.items():
+                if bound is not None:
+                    mask &= self.RANGE_COMPARATORS[operator](column, bound)
+            return mask
+        mask = np.zeros(len(collection.ids), dtype=bool)
+        index = collection.payload_index(field)
+        for option in (value if isinstance(value, list) else [value]):
+            mask[index.get(option, [])] = True
+        return mask
+
+    def _filter_mask(self, collection: FlatCollection, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Boolean row mask of points matching every filter condition; None when unfiltered."""
+        if not filters:
+            return None
+        mask = np.ones(len(collection.ids), dtype=bool)
+        for field, value in filters.items():
+            mask &= self._condition_mask(collection, field, value)
+        return mask
+
+    def _scores(self, collection: FlatCollection, query_vector: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        query = self._prepare_vectors(query_vector, collection.distance)[0]
+        vectors = collection.vectors if rows is None else collection.vectors[rows]
+        if collection.distance in (DistanceMetric.COSINE, DistanceMetric.DOT):
+            return vectors @ query
+        if collection.distance == DistanceMetric.EUCLIDEAN:
+            return -np.linalg.norm(vectors - query, axis=1)
+        return -np.abs(vectors - query).sum(axis=1)
+
+    def _search(self, collection: FlatCollection, query_vector: np.ndarray, k: int,
+                exact: bool = False, mask: Optional[np.ndarray] = None):
+        """Returns (row, score) pairs, best first. The flat index is always exact."""
+        if mask is None:
+            scores = self._scores(collection, query_vector)
+            return [(row, scores[row]) for row in self._top_k(scores, k)]
+        rows = np.flatnonzero(mask)
+        scores = self._scores(collection, query_vector, rows)
+        return [(rows[i], scores[i]) for i in self._top_k(scores, k)]
+
+    def _search_many(self, collection: FlatCollection, query_vectors: np.ndarray, k: int,
+                     exact: bool = False, mask: Optional[np.ndarray] = None):
+        """Per-query (row, score) lists; inner-product metrics score all queries in one matmul."""
+        if collection.distance not in (DistanceMetric.COSINE, DistanceMetric.DOT):
+            return [self._search(collection, query_vector, k, exact, mask) for query_vector in query_vectors]
+        rows = np.arange(len(collection.ids)) if mask is None else np.flatnonzero(mask)
+        vectors = collection.vectors if mask is None else collection.vectors[rows]
+        scores = vectors @ self._prepare_vectors(query_vectors, collection.distance).T
+        return [
+            [(rows[i], column[i]) for i in self._top_k(column, k)]
+            for column in scores.T
+        ]
+
+    def _search_groups(self, collection: FlatCollection, query_vector: np.ndarray, group_by: str,
+                       groups: int, group_size: int, exact: bool = False, mask: Optional[np.ndarray] = None):
+        """
+        Groups hits best-first by a payload field, widening the candidate pool until the
+        best `groups` groups are full or no candidates are left.
+        """
+        limit = groups * group_size * self.GROUP_CANDIDATE_FACTOR
+        while True:
+            hits = self._search(collection, query_vector, limit, exact, mask)
+            grouped: Dict[Any, list] = {}
+            for row, score in hits:
+                value = collection.payloads[row].get(group_by)
+                if not isinstance(value, (str, int)):
+                    continue
+                members = grouped.setdefault(value, [])
+                if len(members) < group_size:
+                    members.append((row, score))
+            # dicts keep first-seen order, i.e. groups ranked by their best hit
+            top = list(grouped.items())[:groups]
+            if len(hits) < limit or (len(top) == groups and all(len(members) == group_size for _, members in top)):
+                return top
+            limit *= self.GROUP_CANDIDATE_FACTOR
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        if k >= len(scores):
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _to_result(self, collection: FlatCollection, row: int, score: float) -> SearchResult:
+        payload = collection.payloads[row]
+        return SearchResult(
+            id=collection.ids[row],
+            score=float(score),
+            content=payload.get("text", payload.get("content", "")),
+            metadata={k: v for k, v in payload.items() if k not in ["text", "content"]},
+        )
+
+    # --- Per-project collection methods (core implementations) ---
+
+    async def create_collection(self, collection_name: str, embedding_dim: int):
+        async with self._lock(collection_name):
+            if self._exists(collection_name):
+                return
+            path = self._collection_path(collection_name)
+            os.makedirs(path, exist_ok=True)
+            open(os.path.join(path, "vectors.f32"), "wb").close()
+            open(os.path.join(path, "payloads.jsonl"), "w").close()
+            self._write_meta(path, {
+                "dim": embedding_dim, "distance": self.distance.value, "count": 0, "generation": 0
+            })
+
+    async def delete_collection(self, collection_name: str):
+        async with self._lock(collection_name):
+            self._collections.pop(collection_name, None)
+            path = self._collection_path(collection_name)
+            if os.path.exists(path):
+                await asyncio.to_thread(shutil.rmtree, path)
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        collection = await self._get_collection(collection_name)
+        if collection is None:
+            return None
+        return {
+            "collection_name": collection_name,
+            "status": "green",
+            "points_count": len(collection.ids),
+            "indexed_vectors_count": len(collection.ids),
+            "config": {
+                "index": "flat",
+                "dim": collection.dim,
+                "distance": collection.distance.value,
+            },
+            "vectors_bytes": os.path.getsize(collection.vectors_path),
+        }
+
+    async def upsert_to_collection(
+        self,
+        collection_name: str,
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]],
+        texts: List[str],
+        ids: Optional[List[str]] = None,
+    ):
+        ids = ids if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        payloads = []
+        for meta, text in zip(metadata, texts):
+            payload = meta.copy() if meta else {}
+            payload["text"] = text
+            payloads.append(payload)
+
+        async with self._lock(collection_name):
+            collection = await asyncio.to_thread(self._load, collection_name)
+            if collection is None:
+                raise ValueError(f"Collection {collection_name} does not exist")
+            prepared = self._prepare_vectors(vectors, collection.distance)
+
+            def write():
+                current = collection
+                replaced = [current.id_to_row[point_id] for point_id in ids if point_id in current.id_to_row]
+                if replaced:
+                    keep_rows = np.setdiff1d(np.arange(len(current.ids)), replaced)
+                    current = self._compact(current, keep_rows)
+                return self._append(current, ids, prepared, payloads)
+
+            self._collections[collection_name] = await asyncio.to_thread(write)
+
+    async def list_point_ids(self, collection_name: str, filters: Optional[Dict[str, Any]] = None) -> Set[str]:
+        collection = await self._get_collection(collection_name)
+        if collection is None:
+            return set()
+        mask = self._filter_mask(collection, filters)
+        if mask is None:
+            return set(collection.ids)
+        return {collection.ids[row] for row in np.flatnonzero(mask)}
+
+    async def count_points(self, collection_name: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        collection = await self._get_collection(collection_name)
+        if collection is None:
+            return 0
+        mask = self._filter_mask(collection, filters)
+        return len(collection.ids) if mask is None else int(mask.sum())
+
+    async def scroll_points(
+        self,
+        collection_name: str,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256,
+    ) -> AsyncIterator[Tuple[List[str], np.ndarray, List[Dict[str, Any]]]]:
+        collection = await self._get_collection(collection_name)
+        if collection is None:
+            return
+        mask = self._filter_mask(collection, filters)
+        rows = np.arange(len(collection.ids)) if mask is None else np.flatnonzero(mask)
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            yield (
+                [collection.ids[row] for row in batch],
+                np.asarray(collection.vectors[batch], dtype=np.float32),
+                [collection.payloads[row] for row in batch],
+            )
+
+    async def search_collection(
+        self,
+        collection_name: str,
+        query_vector: np.ndarray,
+        k: int = 10,
+        query_text: Optional[str] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchResult]:
+        if mode == SearchMode.HYBRID:
+            self.logger.warning(f"{type(self).__name__} has no keyword index; using dense search")
+        collection = await self._get_collection(collection_name)
+        if collection is None or not collection.ids:
+            return []
+
+        mask = self._filter_mask(collection, filters)
+        hits = await asyncio.to_thread(self._search, collection, query_vector, k, exact, mask)
+        return [self._to_result(collection, row, score) for row, score in hits]
+
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: np.ndarray,
+        k: int = 5,
+        query_texts: Optional[List[str]] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        if mode == SearchMode.HYBRID:
+            self.logger.warning(f"{type(self).__name__} has no keyword index; using dense search")
+        collection = await self._get_collection(collection_name)
+        if collection is None or not collection.ids:
+            return [[] for _ in query_vectors]
+
+        mask = self._filter_mask(collection, filters)
+        hits = await asyncio.to_thread(self._search_many, collection, np.asarray(query_vectors), k, exact, mask)
+        return [[self._to_result(collection, row, score) for row, score in query_hits] for query_hits in hits]
+
+    async def search_groups(
+        self,
+        collection_name: str,
+        query_vector: np.ndarray,
+        group_by: str,
+        groups: int = 5,
+        group_size: int = 3,
+        query_text: Optional[str] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchGroup]:
+        if mode == SearchMode.HYBRID:
+            self.logger.warning(f"{type(self).__name__} has no keyword index; using dense search")
+        collection = await self._get_collection(collection_name)
+        if collection is None or not collection.ids:
+            return []
+
+        mask = self._filter_mask(collection, filters)
+        top = await asyncio.to_thread(
+            self._search_groups, collection, query_vector, group_by, groups, group_size, exact, mask
+        )
+        return [
+            SearchGroup(id=str(value), hits=[self._to_result(collection, row, score) for row, score in members])
+            for value, members in top
+        ]
+
+    async def delete_points(self, collection_name: str, point_ids: List[str],
+                            filters: Optional[Dict[str, Any]] = None):
+        async with self._lock(collection_name):
+            collection = await asyncio.to_thread(self._load, collection_name)
+            if collection is None:
+                return
+            removed = [collection.id_to_row[point_id] for point_id in point_ids if point_id in collection.id_to_row]
+            mask = self._filter_mask(collection, filters)
+            if mask is not None:
+                removed = [row for row in removed if mask[row]]
+            if not removed:
+                return
+            keep_rows = np.setdiff1d(np.arange(len(collection.ids)), removed)
+            self._collections[collection_name] = await asyncio.to_thread(self._compact, collection, keep_rows)
+
+    async def delete_by_filter(self, collection_name: str, filters: Dict[str, Any]):
+        async with self._lock(collection_name):
+            collection = await asyncio.to_thread(self._load, collection_name)
+            if collection is None:
+                return
+            mask = self._filter_mask(collection, filters)
+            if mask is None or not mask.any():
+                return
+            keep_rows = np.flatnonzero(~mask)
+            self._collections[collection_name] = await asyncio.to_thread(self._compact, collection, keep_rows)
+
+    # --- Default collection methods (delegate to per-project methods) ---
+
+    async def initialize(self):
+        await self.create_collection(self.collection_name, self.embedding_dim)
+
+    async def upsert(self, documents: List[Dict[str, Any]]):
+        ids, vectors, metadata, texts = [], [], [], []
+        for doc in documents:
+            point_id = str(doc['id'])
+            try:
+                uuid.UUID(point_id)
+            except ValueError:
+                point_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, point_id))
+            ids.append(point_id)
+            vectors.append(doc['vector'])
+            metadata.append(doc.get('metadata', {}))
+            texts.append(doc.get('text', doc.get('content', '')))
+        await self.upsert_to_collection(self.collection_name, np.asarray(vectors), metadata, texts, ids)
+
+    async def search_vector_only(self, query_vector: List[float], k: int = 5) -> List[SearchResult]:
+        return await self.search_collection(self.collection_name, np.asarray(query_vector), k)
+
+    async def delete(self, doc_id: str):
+        await self.delete_points(self.collection_name, [doc_id])
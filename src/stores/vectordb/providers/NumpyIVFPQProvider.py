@@ -0,0 +1,321 @@
+import asyncio
+import os
+import numpy as np
+from typing import List, Optional
+from .NumpyFlatProvider import NumpyFlatProvider, FlatCollection
+from ..VectorDBEnums import DistanceMetric, VectorDBConfig
+
+ENCODE_BLOCK_ROWS = 65536
+
+
+def _squared_distances(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return (
+        np.einsum("ij,ij->i", x, x)[:, None]
+        - 2 * x @ centroids.T
+        + np.einsum("ij,ij->i", centroids, centroids)[None, :]
+    )
+
+
+def _nearest(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(len(x), dtype=np.int32)
+    for start in range(0, len(x), ENCODE_BLOCK_ROWS):
+        block = x[start:start + ENCODE_BLOCK_ROWS]
+        assignments[start:start + len(block)] = _squared_distances(block, centroids).argmin(axis=1)
+    return assignments
+
+
+def _kmeans(x: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest(x, centroids)
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, x)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # re-seed empty clusters from random points
+        if (~filled).any():
+            centroids[~filled] = x[rng.choice(len(x), int((~filled).sum()), replace=False)]
+    return centroids
+
+
+class IVFPQIndex:
+    """
+    Inverted-file index with product-quantized residuals.
+
+    Vectors are assigned to the nearest of nlist coarse centroids; the
+    residual to that centroid is split into m sub-vectors, each replaced by
+    the id of its nearest sub-codebook entry (one byte). Search probes the
+    nprobe closest lists and scores candidates from lookup tables.
+    """
+
+    def __init__(self, centroids: np.ndarray, codebooks: np.ndarray, codes: np.ndarray,
+                 lists: np.ndarray, trained_count: int, collection_size: Optional[int] = None):
+        self.centroids = centroids
+        self.codebooks = codebooks
+        self.codes = codes
+        self.lists = lists
+        self.trained_count = trained_count
+        # points in the collection when it was trained; the sample itself is capped at train_size
+        self.collection_size = trained_count if collection_size is None else collection_size
+        self.order = np.argsort(lists, kind="stable")
+        self.bounds = np.searchsorted(lists[self.order], np.arange(len(centroids) + 1))
+
+    @property
+    def m(self) -> int:
+        return self.codebooks.shape[0]
+
+    @classmethod
+    def train(cls, sample: np.ndarray, nlist: int, m: int, iterations: int = 20, seed: int = 0,
+              collection_size: Optional[int] = None):
+        rng = np.random.default_rng(seed)
+        dim = sample.shape[1]
+        nlist = max(1, min(nlist, len(sample) // 39))
+        m = max(divisor for divisor in range(1, min(m, dim) + 1) if dim % divisor == 0)
+        ksub = min(256, len(sample))
+
+        centroids = _kmeans(sample, nlist, iterations, rng)
+        residuals = sample - centroids[_nearest(sample, centroids)]
+        sub_dim = dim // m
+        codebooks = np.stack([
+            _kmeans(np.ascontiguousarray(residuals[:, j * sub_dim:(j + 1) * sub_dim]), ksub, iterations, rng)
+            for j in range(m)
+        ])
+        empty_codes = np.empty((0, m), dtype=np.uint8)
+        return cls(centroids, codebooks, empty_codes, np.empty(0, dtype=np.int32), len(sample), collection_size)
+
+    def encode(self, vectors: np.ndarray):
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        lists = np.empty(len(vectors), dtype=np.int32)
+        sub_dim = self.codebooks.shape[2]
+        for start in range(0, len(vectors), ENCODE_BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + ENCODE_BLOCK_ROWS], dtype=np.float32)
+            block_lists = _nearest(block, self.centroids)
+            residuals = block - self.centroids[block_lists]
+            for j in range(self.m):
+                codes[start:start + len(block), j] = _nearest(
+                    np.ascontiguousarray(residuals[:, j * sub_dim:(j + 1) * sub_dim]), self.codebooks[j]
+                )
+            lists[start:start + len(block)] = block_lists
+        return codes, lists
+
+    def extend(self, codes: np.ndarray, lists: np.ndarray) -> "IVFPQIndex":
+        return IVFPQIndex(self.centroids, self.codebooks, np.concatenate([self.codes, codes]),
+                          np.concatenate([self.lists, lists]), self.trained_count, self.collection_size)
+
+    def subset(self, rows: np.ndarray) -> "IVFPQIndex":
+        return IVFPQIndex(self.centroids, self.codebooks, self.codes[rows], self.lists[rows],
+                          self.trained_count, self.collection_size)
+
+    def search(self, query: np.ndarray, limit: int, nprobe: int, inner_product: bool,
+               allowed: Optional[np.ndarray] = None):
+        """
+        Returns (rows, scores) of the best `limit` candidates by approximate score, best first.
+        Rows outside the `allowed` mask are skipped while scanning the lists.
+        """
+        sub_dim = self.codebooks.shape[2]
+        query_subs = query.reshape(self.m, sub_dim)
+        if inner_product:
+            coarse = self.centroids @ query
+        else:
+            coarse = -_squared_distances(query[None, :], self.centroids)[0]
+        probe = np.argsort(-coarse)[:nprobe]
+
+        rows, scores = [], []
+        if inner_product:
+            # q.(c + r) = q.c + sum_j q_j.r_j, so one table serves every list
+            table = np.einsum("jkd,jd->jk", self.codebooks, query_subs)
+        for list_id in probe:
+            list_rows = self.order[self.bounds[list_id]:self.bounds[list_id + 1]]
+            if allowed is not None:
+                list_rows = list_rows[allowed[list_rows]]
+            if not len(list_rows):
+                continue
+            if not inner_product:
+                residual = (query - self.centroids[list_id]).reshape(self.m, sub_dim)
+                table = -((self.codebooks - residual[:, None, :]) ** 2).sum(axis=2)
+            partial = table[np.arange(self.m)[None, :], self.codes[list_rows]].sum(axis=1)
+            rows.append(list_rows)
+            scores.append(partial + coarse[list_id] if inner_product else partial)
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        rows, scores = np.concatenate(rows), np.concatenate(scores)
+        top = NumpyFlatProvider._top_k(scores, limit)
+        return rows[top], scores[top]
+
+
+class NumpyIVFPQProvider(NumpyFlatProvider):
+    """
+    Approximate, compact-memory variant of NumpyFlatProvider.
+
+    Raw vectors stay on disk (memory-mapped, touched only for training and
+    optional reranking); RAM holds the coarse centroids, PQ codebooks and m
+    bytes of code per vector. Collections below the training threshold, and
+    exact=True searches, are answered by the flat path.
+    """
+
+    ROOT_DIRECTORY = "numpy_ivfpq"
+
+    def __init__(self, config: VectorDBConfig):
+        super().__init__(config)
+        self.nlist = config.ivf_nlist
+        self.nprobe = config.ivf_nprobe
+        self.pq_m = config.pq_m
+        self.train_size = config.ivf_train_size
+        self.min_train_points = config.ivf_min_train_points
+        self.rerank_factor = config.ivf_rerank_factor
+
+    # --- Index persistence ---
+
+    def _index_paths(self, collection: FlatCollection):
+        return (
+            os.path.join(collection.path, "ivfpq.npz"),
+            os.path.join(collection.path, "codes.u8"),
+            os.path.join(collection.path, "lists.i32"),
+        )
+
+    def _write_index(self, collection: FlatCollection, index: IVFPQIndex):
+        model_path, codes_path, lists_path = self._index_paths(collection)
+        with open(model_path + ".tmp", "wb") as f:
+            np.savez(f, centroids=index.centroids, codebooks=index.codebooks,
+                     trained_count=np.array(index.trained_count),
+                     collection_size=np.array(index.collection_size))
+        index.codes.tofile(codes_path + ".tmp")
+        index.lists.tofile(lists_path + ".tmp")
+        for path in (model_path, codes_path, lists_path):
+            os.replace(path + ".tmp", path)
+
+    def _remove_index(self, collection: FlatCollection):
+        for path in self._index_paths(collection):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _read_index(self, collection: FlatCollection) -> Optional[IVFPQIndex]:
+        model_path, codes_path, lists_path = self._index_paths(collection)
+        if not os.path.exists(model_path):
+            return self._build_index(collection)
+        with np.load(model_path) as model:
+            centroids, codebooks = model["centroids"], model["codebooks"]
+            trained_count = int(model["trained_count"])
+            # indexes written before collection_size was stored only know the sample size
+            collection_size = int(model["collection_size"]) if "collection_size" in model else trained_count
+        m = codebooks.shape[0]
+        codes = np.fromfile(codes_path, dtype=np.uint8) if os.path.exists(codes_path) else np.empty(0, np.uint8)
+        lists = np.fromfile(lists_path, dtype=np.int32) if os.path.exists(lists_path) else np.empty(0, np.int32)
+        if len(lists) != len(collection.ids) or len(codes) != len(collection.ids) * m:
+            # codes out of step with the committed rows: re-encode with the trained model
+            index = IVFPQIndex(centroids, codebooks, np.empty((0, m), np.uint8), np.empty(0, np.int32),
+                               trained_count, collection_size)
+            index = index.extend(*index.encode(collection.vectors))
+            self._write_index(collection, index)
+            return index
+        return IVFPQIndex(centroids, codebooks, codes.reshape(-1, m), lists, trained_count, collection_size)
+
+    def _build_index(self, collection: FlatCollection) -> Optional[IVFPQIndex]:
+        """Trains on a sample of the stored vectors once the collection is large enough."""
+        count = len(collection.ids)
+        if count < max(self.min_train_points, 256):
+            self._remove_index(collection)
+            return None
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(rng.choice(count, min(count, self.train_size), replace=False))
+        index = IVFPQIndex.train(np.asarray(collection.vectors[sample_rows]), self.nlist, self.pq_m,
+                                 collection_size=count)
+        index = index.extend(*index.encode(collection.vectors))
+        self._write_index(collection, index)
+        return index
+
+    # --- Storage hooks ---
+
+    def _load(self, collection_name: str) -> Optional[FlatCollection]:
+        cached = collection_name in self._collections
+        collection = super()._load(collection_name)
+        if collection is not None and not cached:
+            collection.index = self._read_index(collection)
+        return collection
+
+    def _append(self, collection: FlatCollection, ids: List[str], vectors: np.ndarray, payloads: List[dict]) -> FlatCollection:
+        index = collection.index
+        updated = super()._append(collection, ids, vectors, payloads)
+        # retrain when the collection has grown 4x past its size at the last training
+        if index is None or len(updated.ids) >= 4 * index.collection_size:
+            updated.index = self._build_index(updated)
+            return updated
+
+        codes, lists = index.encode(vectors)
+        model_path, codes_path, lists_path = self._index_paths(updated)
+        with open(codes_path, "ab") as f:
+            f.write(codes.tobytes())
+        with open(lists_path, "ab") as f:
+            f.write(lists.tobytes())
+        updated.index = index.extend(codes, lists)
+        return updated
+
+    def _compact(self, collection: FlatCollection, keep_rows: np.ndarray) -> FlatCollection:
+        index = collection.index
+        compacted = super()._compact(collection, keep_rows)
+        compacted.index = index.subset(keep_rows) if index is not None else None
+        if compacted.index is not None:
+            self._write_index(compacted, compacted.index)
+        return compacted
+
+    # --- Search ---
+
+    def _search(self, collection: FlatCollection, query_vector: np.ndarray, k: int,
+                exact: bool = False, mask: Optional[np.ndarray] = None):
+        index = collection.index
+        # a selective filter leaves too few points per list: scan the matching rows exactly
+        small_subset = mask is not None and mask.sum() < self.min_train_points
+        if exact or small_subset or index is None or collection.distance == DistanceMetric.MANHATTAN:
+            return super()._search(collection, query_vector, k, exact, mask)
+
+        query = self._prepare_vectors(query_vector, collection.distance)[0]
+        inner_product = collection.distance in (DistanceMetric.COSINE, DistanceMetric.DOT)
+        limit = k * max(self.rerank_factor, 1)
+        rows, scores = index.search(query, limit, self.nprobe, inner_product, allowed=mask)
+
+        # 0 disables reranking; 1 rescores the k PQ hits exactly, larger factors widen the shortlist
+        if self.rerank_factor >= 1 and len(rows):
+            # rescore the shortlist against the on-disk originals
+            candidates = np.asarray(collection.vectors[np.sort(rows)])
+            rows = np.sort(rows)
+            if inner_product:
+                scores = candidates @ query
+            else:
+                scores = -np.linalg.norm(candidates - query, axis=1)
+        elif not inner_product:
+            scores = -np.sqrt(np.maximum(-scores, 0))
+
+        top = self._top_k(scores, k)
+        return [(int(rows[i]), scores[i]) for i in top]
+
+    def _search_many(self, collection: FlatCollection, query_vectors: np.ndarray, k: int,
+                     exact: bool = False, mask: Optional[np.ndarray] = None):
+        if collection.index is None or exact:
+            return super()._search_many(collection, query_vectors, k, exact, mask)
+        return [self._search(collection, query_vector, k, exact, mask) for query_vector in query_vectors]
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        info = await super().get_collection_info(collection_name)
+        if info is None:
+            return None
+        collection = self._collections.get(collection_name)
+        index = collection.index if collection is not None else None
+        info["config"].update({
+            "index": "ivf_pq" if index is not None else "flat (untrained)",
+            "nlist": len(index.centroids) if index is not None else None,
+            "pq_m": index.m if index is not None else None,
+            "nprobe": self.nprobe,
+            "rerank_factor": self.rerank_factor,
+        })
+        info["indexed_vectors_count"] = len(index.lists) if index is not None else 0
+        info["codes_bytes"] = int(index.codes.nbytes) if index is not None else 0
+        return info
+
+    async def initialize(self):
+        await super().initialize()
+        # load every persisted index up front so the first search is not a cold start
+        for collection_name in os.listdir(self.root):
+            if self._exists(collection_name):
+                await self._get_collection(collection_name)
@@ -1,11 +1,23 @@
 import uuid
+import logging
+import numpy as np
 from qdrant_client import AsyncQdrantClient, models
-from typing import List, Dict, Any, Optional
-from ..VectorDBInterface import VectorDBInterface, SearchResult
-from ..VectorDBEnums import DistanceMetric, VectorDBConfig
+from typing import List, Dict, Any, Optional, Set, AsyncIterator, Tuple
+from ..VectorDBInterface import VectorDBInterface, SearchResult, SearchGroup
+from ..VectorDBEnums import DistanceMetric, VectorDBConfig, SearchMode, QuantizationType
+from ..BM25Encoder import BM25Encoder
 
 
 class QdrantdbProvider(VectorDBInterface):
+    SPARSE_VECTOR_NAME = "bm25"
+    HYBRID_PREFETCH_FACTOR = 4
+    PAYLOAD_SCHEMAS = {
+        "keyword": models.PayloadSchemaType.KEYWORD,
+        "integer": models.PayloadSchemaType.INTEGER,
+        "float": models.PayloadSchemaType.FLOAT,
+        "bool": models.PayloadSchemaType.BOOL,
+    }
+
     def __init__(self, config: VectorDBConfig):
         self.client = AsyncQdrantClient(path=config.path, api_key=config.api_key, timeout=60)
         self.collection_name = config.collection_name
@@ -20,8 +32,102 @@ class QdrantdbProvider(VectorDBInterface):
         }
         self.distance_metric = distance_map.get(distance_enum, models.Distance.COSINE)
 
+        self.config = config
+        self.quantization = QuantizationType(config.quantization)
+
+        self.bm25_encoder = BM25Encoder()
+        self._sparse_enabled: Dict[str, bool] = {}
+        self._indexed_collections: Set[str] = set()
+        self.logger = logging.getLogger(__name__)
+
+    def _to_sparse_vector(self, sparse_data) -> models.SparseVector:
+        indices, values = sparse_data
+        return models.SparseVector(indices=indices, values=values)
+
+    def _build_condition(self, field: str, value: Any) -> models.FieldCondition:
+        if isinstance(value, dict):
+            unknown = set(value) - self.RANGE_OPERATORS
+            if unknown:
+                raise ValueError(f"Unsupported range operators for '{field}': {sorted(unknown)}")
+            return models.FieldCondition(key=field, range=models.Range(**value))
+        if isinstance(value, list):
+            return models.FieldCondition(key=field, match=models.MatchAny(any=value))
+        return models.FieldCondition(key=field, match=models.MatchValue(value=value))
+
+    def _build_filter(self, filters: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+        if not filters:
+            return None
+        return models.Filter(must=[self._build_condition(field, value) for field, value in filters.items()])
+
+    def _quantization_config(self):
+        if self.quantization == QuantizationType.SCALAR:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.config.quantization_always_ram,
+                )
+            )
+        if self.quantization == QuantizationType.BINARY:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.config.quantization_always_ram,
+                )
+            )
+        return None
+
+    def _hnsw_config(self):
+        if self.config.tenant_field:
+            # every search is scoped to one tenant: build per-tenant graphs instead of a global one
+            return models.HnswConfigDiff(
+                m=0,
+                payload_m=self.config.hnsw_m or 16,
+                ef_construct=self.config.hnsw_ef_construct,
+            )
+        if self.config.hnsw_m is None and self.config.hnsw_ef_construct is None:
+            return None
+        return models.HnswConfigDiff(
+            m=self.config.hnsw_m,
+            ef_construct=self.config.hnsw_ef_construct,
+        )
+
+    def _search_params(self, exact: bool = False) -> models.SearchParams:
+        quantization_params = None
+        if self.quantization != QuantizationType.NONE:
+            quantization_params = models.QuantizationSearchParams(
+                rescore=self.config.search_rescore,
+                oversampling=self.config.search_oversampling,
+            )
+        return models.SearchParams(
+            hnsw_ef=self.config.search_hnsw_ef,
+            exact=exact,
+            quantization=quantization_params,
+        )
+
+    async def has_sparse_vectors(self, collection_name: str) -> bool:
+        """Collections created before hybrid search have no BM25 vectors."""
+        if collection_name not in self._sparse_enabled:
+            info = await self.client.get_collection(collection_name=collection_name)
+            sparse_config = info.config.params.sparse_vectors or {}
+            self._sparse_enabled[collection_name] = self.SPARSE_VECTOR_NAME in sparse_config
+        return self._sparse_enabled[collection_name]
+
     # --- Per-project collection methods (core implementations) ---
 
+    async def _ensure_payload_indexes(self, collection_name: str):
+        """Index filterable fields so filters are applied during HNSW traversal; also covers older collections."""
+        if collection_name in self._indexed_collections:
+            return
+        for field_name, field_type in self.config.payload_indexes.items():
+            if field_type not in self.PAYLOAD_SCHEMAS:
+                raise ValueError(f"Unsupported payload index type '{field_type}' for '{field_name}'")
+            await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=self.PAYLOAD_SCHEMAS[field_type],
+            )
+        self._indexed_collections.add(collection_name)
+
     async def create_collection(self, collection_name: str, embedding_dim: int):
         if not await self.client.collection_exists(collection_name=collection_name):
             await self.client.create_collection(
@@ -29,7 +135,13 @@ class QdrantdbProvider(VectorDBInterface):
                 vectors_config=models.VectorParams(
                     size=embedding_dim,
                     distance=self.distance_metric,
+                    on_disk=self.config.on_disk_vectors,
                 ),
+                hnsw_config=self._hnsw_config(),
+                quantization_config=self._quantization_config(),
+                sparse_vectors_config={
+                    self.SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF),
+                },
             )
             await self.client.create_payload_index(
                 collection_name=collection_name,
@@ -41,8 +153,17 @@ class QdrantdbProvider(VectorDBInterface):
                     min_token_len=2,
                 ),
             )
+            if self.config.tenant_field:
+                await self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=self.config.tenant_field,
+                    field_schema=models.KeywordIndexParams(type="keyword", is_tenant=True),
+                )
+        await self._ensure_payload_indexes(collection_name)
 
     async def delete_collection(self, collection_name: str):
+        self._sparse_enabled.pop(collection_name, None)
+        self._indexed_collections.discard(collection_name)
         if await self.client.collection_exists(collection_name=collection_name):
             await self.client.delete_collection(collection_name=collection_name)
 
@@ -65,53 +186,232 @@ class QdrantdbProvider(VectorDBInterface):
     async def upsert_to_collection(
         self,
         collection_name: str,
-        vectors: List[List[float]],
+        vectors: np.ndarray,
         metadata: List[Dict[str, Any]],
         texts: List[str],
+        ids: Optional[List[str]] = None,
     ):
-        points = []
-        for i, (vector, meta, text) in enumerate(zip(vectors, metadata, texts)):
-            point_id = str(uuid.uuid4())
+        payloads = []
+        for meta, text in zip(metadata, texts):
             payload = meta.copy() if meta else {}
             payload["text"] = text
-            points.append(
-                models.PointStruct(id=point_id, vector=vector, payload=payload)
-            )
+            payloads.append(payload)
+
+        # one bulk conversion of the whole matrix for the wire format
+        dense_vectors = np.asarray(vectors, dtype=np.float32).tolist()
+        if await self.has_sparse_vectors(collection_name):
+            batch_vectors = {
+                "": dense_vectors,
+                self.SPARSE_VECTOR_NAME: [
+                    self._to_sparse_vector(sparse)
+                    for sparse in self.bm25_encoder.encode_documents(texts)
+                ],
+            }
+        else:
+            batch_vectors = dense_vectors
 
         await self.client.upsert(
             collection_name=collection_name,
-            points=points,
+            points=models.Batch(
+                ids=ids if ids is not None else [str(uuid.uuid4()) for _ in payloads],
+                vectors=batch_vectors,
+                payloads=payloads,
+            ),
             wait=True,
         )
 
+    async def list_point_ids(self, collection_name: str, filters: Optional[Dict[str, Any]] = None) -> Set[str]:
+        point_ids = set()
+        if not await self.client.collection_exists(collection_name=collection_name):
+            return point_ids
+        offset = None
+        while True:
+            records, offset = await self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=self._build_filter(filters),
+                limit=1000,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            point_ids.update(str(record.id) for record in records)
+            if offset is None:
+                return point_ids
+
+    async def count_points(self, collection_name: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        if not await self.client.collection_exists(collection_name=collection_name):
+            return 0
+        result = await self.client.count(
+            collection_name=collection_name,
+            count_filter=self._build_filter(filters),
+            exact=True,
+        )
+        return result.count
+
+    async def scroll_points(
+        self,
+        collection_name: str,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256,
+    ) -> AsyncIterator[Tuple[List[str], np.ndarray, List[Dict[str, Any]]]]:
+        if not await self.client.collection_exists(collection_name=collection_name):
+            return
+        offset = None
+        while True:
+            records, offset = await self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=self._build_filter(filters),
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if records:
+                # collections with sparse vectors return named vectors; the dense one is unnamed
+                dense = [r.vector[""] if isinstance(r.vector, dict) else r.vector for r in records]
+                yield (
+                    [str(record.id) for record in records],
+                    np.asarray(dense, dtype=np.float32),
+                    [record.payload for record in records],
+                )
+            if offset is None:
+                return
+
+    async def _query_arguments(
+        self,
+        collection_name: str,
+        query_vector: np.ndarray,
+        candidate_limit: int,
+        query_text: Optional[str],
+        mode: SearchMode,
+        exact: bool,
+        filters: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Query arguments shared by plain and grouped search."""
+        search_params = self._search_params(exact=exact)
+        query_filter = self._build_filter(filters)
+        if mode == SearchMode.HYBRID and query_text and await self.has_sparse_vectors(collection_name):
+            # dense and BM25 candidates fused server-side with reciprocal rank fusion
+            prefetch_limit = candidate_limit * self.HYBRID_PREFETCH_FACTOR
+            return {
+                "prefetch": [
+                    models.Prefetch(
+                        query=query_vector, params=search_params, filter=query_filter, limit=prefetch_limit
+                    ),
+                    models.Prefetch(
+                        query=self._to_sparse_vector(self.bm25_encoder.encode_query(query_text)),
+                        using=self.SPARSE_VECTOR_NAME,
+                        filter=query_filter,
+                        limit=prefetch_limit,
+                    ),
+                ],
+                "query": models.FusionQuery(fusion=models.Fusion.RRF),
+            }
+        if mode == SearchMode.HYBRID:
+            self.logger.warning(
+                f"Collection {collection_name} has no BM25 vectors; falling back to dense search"
+            )
+        return {"query": query_vector, "query_filter": query_filter, "search_params": search_params}
+
+    def _to_search_result(self, point) -> SearchResult:
+        return SearchResult(
+            id=str(point.id),
+            score=point.score,
+            content=point.payload.get("text", point.payload.get("content", "")),
+            metadata={
+                k: v for k, v in point.payload.items() if k not in ["text", "content"]
+            },
+        )
+
     async def search_collection(
         self,
         collection_name: str,
-        query_vector: List[float],
+        query_vector: np.ndarray,
         k: int = 10,
+        query_text: Optional[str] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
         response = await self.client.query_points(
             collection_name=collection_name,
-            query=query_vector,
             limit=k,
             with_payload=True,
+            **await self._query_arguments(collection_name, query_vector, k, query_text, mode, exact, filters),
         )
-        return [
-            SearchResult(
-                id=str(point.id),
-                score=point.score,
-                content=point.payload.get("text", point.payload.get("content", "")),
-                metadata={
-                    k: v for k, v in point.payload.items() if k not in ["text", "content"]
-                },
+        return [self._to_search_result(point) for point in response.points]
+
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: np.ndarray,
+        k: int = 5,
+        query_texts: Optional[List[str]] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        requests = []
+        for i, query_vector in enumerate(query_vectors):
+            arguments = await self._query_arguments(
+                collection_name, query_vector, k, query_texts[i] if query_texts else None, mode, exact, filters
             )
-            for point in response.points
+            requests.append(models.QueryRequest(
+                prefetch=arguments.get("prefetch"),
+                query=arguments["query"],
+                filter=arguments.get("query_filter"),
+                params=arguments.get("search_params"),
+                limit=k,
+                with_payload=True,
+            ))
+        responses = await self.client.query_batch_points(collection_name=collection_name, requests=requests)
+        return [[self._to_search_result(point) for point in response.points] for response in responses]
+
+    async def search_groups(
+        self,
+        collection_name: str,
+        query_vector: np.ndarray,
+        group_by: str,
+        groups: int = 5,
+        group_size: int = 3,
+        query_text: Optional[str] = None,
+        mode: SearchMode = SearchMode.DENSE,
+        exact: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchGroup]:
+        response = await self.client.query_points_groups(
+            collection_name=collection_name,
+            group_by=group_by,
+            limit=groups,
+            group_size=group_size,
+            with_payload=True,
+            **await self._query_arguments(
+                collection_name, query_vector, groups * group_size, query_text, mode, exact, filters
+            ),
+        )
+        return [
+            SearchGroup(id=str(group.id), hits=[self._to_search_result(point) for point in group.hits])
+            for group in response.groups
         ]
 
-    async def delete_points(self, collection_name: str, point_ids: List[str]):
+    async def delete_points(self, collection_name: str, point_ids: List[str],
+                            filters: Optional[Dict[str, Any]] = None):
+        if filters:
+            # ids and payload conditions in one filter, so the check and the delete are one request
+            conditions = [self._build_condition(field, value) for field, value in filters.items()]
+            selector = models.FilterSelector(
+                filter=models.Filter(must=[*conditions, models.HasIdCondition(has_id=point_ids)])
+            )
+        else:
+            selector = models.PointIdsList(points=point_ids)
+        await self.client.delete(collection_name=collection_name, points_selector=selector)
+
+    async def delete_by_filter(self, collection_name: str, filters: Dict[str, Any]):
+        if not await self.client.collection_exists(collection_name=collection_name):
+            return
         await self.client.delete(
             collection_name=collection_name,
-            points_selector=models.PointIdsList(points=point_ids),
+            points_selector=models.FilterSelector(filter=self._build_filter(filters)),
         )
 
     # --- Default collection methods (delegate to per-project methods) ---
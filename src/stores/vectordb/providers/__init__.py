@@ -1 +1,3 @@
-from .QdrantdbProvider import QdrantdbProvider
\ No newline at end of file
+from .QdrantdbProvider import QdrantdbProvider
+from .NumpyFlatProvider import NumpyFlatProvider
+from .NumpyIVFPQProvider import NumpyIVFPQProvider
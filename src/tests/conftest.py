@@ -0,0 +1,5 @@
+import os
+import sys
+
+# modules import each other from the src root (e.g. `from utils import ...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,73 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from stores.llm import CachedEmbeddingProvider, EmbeddingCache, QueryEmbeddingCache
+
+
+class FakeProvider:
+    """Embeds each text as [len(text), 1]; `result` overrides what the batch calls return."""
+
+    embedding_dimension = 2
+    embedding_model_id = "fake"
+
+    def __init__(self, result="vectors"):
+        self.result = result
+
+    def _vectors(self, texts):
+        if self.result == "vectors":
+            return np.asarray([[len(text), 1] for text in texts], dtype=np.float32)
+        if self.result == "short":
+            return np.asarray([[len(text), 1] for text in texts[:-1]], dtype=np.float32)
+        return None
+
+    async def embed_documents(self, texts):
+        return self._vectors(texts)
+
+    async def embed_queries(self, texts):
+        return self._vectors(texts)
+
+    async def embed_query(self, text):
+        return None if self.result is None else self._vectors([text])[0]
+
+
+@pytest.fixture
+def caches(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.sqlite3"))
+    yield cache, QueryEmbeddingCache()
+    cache.close()
+
+
+@pytest.mark.parametrize("result", [None, "short"])
+def test_failed_batches_raise_and_are_not_cached(caches, result):
+    cache, query_cache = caches
+    provider = CachedEmbeddingProvider(FakeProvider(result), cache=cache, query_cache=query_cache)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(provider.embed_queries(["a", "bb", "ccc"]))
+    with pytest.raises(RuntimeError):
+        asyncio.run(provider.embed_documents(["a", "bb", "ccc"]))
+    assert len(query_cache._entries) == 0
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_failed_query_raises_and_is_not_cached(caches):
+    cache, query_cache = caches
+    provider = CachedEmbeddingProvider(FakeProvider(None), cache=cache, query_cache=query_cache)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(provider.embed_query("a"))
+    assert len(query_cache._entries) == 0
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_queries_are_cached_in_input_order(caches):
+    cache, query_cache = caches
+    provider = CachedEmbeddingProvider(FakeProvider(), cache=cache, query_cache=query_cache)
+
+    asyncio.run(provider.embed_queries(["bb"]))
+    vectors = asyncio.run(provider.embed_queries(["a", "bb", "ccc"]))
+
+    assert vectors[:, 0].tolist() == [1, 2, 3]
+    assert len(query_cache._entries) == 3
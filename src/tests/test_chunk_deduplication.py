@@ -0,0 +1,140 @@
+import asyncio
+import random
+
+import pytest
+
+from controllers import ProcessController
+from models import Chunk
+
+WORDS = [f"w{i}" for i in range(3000)]
+
+
+class FakeChunkModel:
+    """In-memory stand-in for the ChunkModel calls made while writing chunks."""
+
+    def __init__(self):
+        self.rows = []
+
+    async def get_chunks_by_file_id(self, **kwargs):
+        return []
+
+    async def get_chunks_by_band_keys(self, project_id, band_keys):
+        keys = set(band_keys)
+        return [row for row in self.rows if row.project_id == project_id and not row.duplicate_of
+                and keys & set(row.lsh_bands or [])]
+
+    async def create_chunks_bulk(self, chunks):
+        await asyncio.sleep(0)
+        self.rows.extend(chunks)
+        return len(chunks)
+
+    async def delete_chunks_by_file_id(self, file_id, chunk_size, chunk_overlap, project_id):
+        self.rows = [row for row in self.rows if row.metadata["file_id"] != file_id]
+
+
+def make_texts(seed, count):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(150)) for _ in range(count)]
+
+
+def make_controller(monkeypatch, chunk_model, mode, texts_by_file, failing_file=None):
+    controller = ProcessController("p")
+    controller.dedup_mode = mode
+    controller.app_settings.CHUNK_FLUSH_BATCH_SIZE = 10
+
+    async def chunk_file(chunk_model, file_id, *args):
+        created = 0
+        texts = texts_by_file[file_id]
+        for start in range(0, len(texts), 10):
+            batch = [
+                Chunk(content=text, metadata={"file_id": file_id}, chunk_order=start + i + 1, project_id="p")
+                for i, text in enumerate(texts[start:start + 10])
+            ]
+            created += await controller.write_chunks(chunk_model, batch, file_id)
+            if file_id == failing_file and start >= 10:
+                raise RuntimeError("parse failed")
+        return created
+
+    monkeypatch.setattr(controller, "_chunk_file", chunk_file)
+    return controller
+
+
+async def process(controller, chunk_model, file_ids):
+    return await asyncio.gather(
+        *[controller.process_one_file(chunk_model, file_id) for file_id in file_ids],
+        return_exceptions=True,
+    )
+
+
+@pytest.mark.parametrize("mode", ["flag", "collapse"])
+def test_failed_file_leaves_no_dangling_duplicates(monkeypatch, mode):
+    shared = make_texts(0, 30)
+    chunk_model = FakeChunkModel()
+    controller = make_controller(
+        monkeypatch, chunk_model, mode, {"a": shared, "b": list(shared)}, failing_file="a"
+    )
+    outcomes = asyncio.run(process(controller, chunk_model, ["a", "b"]))
+
+    assert isinstance(outcomes[0], RuntimeError)
+    assert outcomes[1] == 30
+    assert [row.metadata["file_id"] for row in chunk_model.rows] == ["b"] * 30
+    assert not any(row.duplicate_of for row in chunk_model.rows)
+    assert controller.duplicates_count == 0
+    assert not any(chunk_id in controller.duplicate_detector for chunk_id in controller._discarded_ids)
+
+
+@pytest.mark.parametrize("mode", ["flag", "collapse"])
+def test_duplicates_of_committed_files_are_detected(monkeypatch, mode):
+    shared = make_texts(1, 30)
+    chunk_model = FakeChunkModel()
+    controller = make_controller(monkeypatch, chunk_model, mode, {"a": shared, "b": list(shared)})
+    asyncio.run(process(controller, chunk_model, ["a"]))
+    outcomes = asyncio.run(process(controller, chunk_model, ["b"]))
+
+    assert controller.duplicates_count == 30
+    originals = {row.id for row in chunk_model.rows if row.metadata["file_id"] == "a"}
+    flagged = [row for row in chunk_model.rows if row.metadata["file_id"] == "b"]
+    if mode == "flag":
+        assert outcomes == [30]
+        assert all(row.duplicate_of in originals for row in flagged)
+    else:
+        assert outcomes == [0]
+        assert flagged == []
+
+
+class FakeAssetModel:
+    """In-memory stand-in for the AssetModel processed-split markers."""
+
+    def __init__(self):
+        self.processed = {}
+
+    async def get_processed_count(self, project_id, name, chunk_size, chunk_overlap):
+        return self.processed.get((project_id, name, chunk_size, chunk_overlap))
+
+    async def mark_processed(self, project_id, name, chunk_size, chunk_overlap, chunks_count):
+        self.processed[(project_id, name, chunk_size, chunk_overlap)] = chunks_count
+
+
+def test_fully_collapsed_file_is_not_processed_again(monkeypatch):
+    shared = make_texts(2, 20)
+    chunk_model = FakeChunkModel()
+    asset_model = FakeAssetModel()
+    controller = make_controller(monkeypatch, chunk_model, "collapse", {"a": shared, "b": list(shared)})
+    chunk_file = controller._chunk_file
+    chunked = []
+
+    async def counting_chunk_file(chunk_model, file_id, *args):
+        chunked.append(file_id)
+        return await chunk_file(chunk_model, file_id, *args)
+
+    monkeypatch.setattr(controller, "_chunk_file", counting_chunk_file)
+
+    async def process_with_assets(file_id):
+        return await controller.process_one_file(chunk_model, file_id, asset_model=asset_model)
+
+    assert asyncio.run(process_with_assets("a")) == 20
+    assert asyncio.run(process_with_assets("b")) == 0
+    assert asyncio.run(process_with_assets("b")) == 0
+    assert asyncio.run(process_with_assets("a")) == 20
+    assert chunked == ["a", "b"]
+    assert controller.duplicates_count == 20
@@ -0,0 +1,28 @@
+import numpy as np
+
+from stores.llm import EmbeddingCache
+
+
+def vectors(keys, value):
+    return {key: np.full(2, value, dtype=np.float32) for key in keys}
+
+
+def test_rewriting_keys_does_not_inflate_the_entry_count(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.sqlite3"))
+    cache.put_many(vectors(["a", "b"], 1))
+    cache.put_many(vectors(["a", "b", "c"], 2))
+    cache.put_many(vectors(["c"], 3))
+
+    assert cache.get_stats()["entries"] == cache._count() == 3
+    assert cache.get_many(["a", "c"])["c"].tolist() == [3, 3]
+    cache.close()
+
+
+def test_rewrites_do_not_trigger_eviction(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.sqlite3"), max_entries=3)
+    for value in range(5):
+        cache.put_many(vectors(["a", "b", "c"], value))
+
+    assert cache.evictions == 0
+    assert cache.get_stats()["entries"] == 3
+    cache.close()
@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+from stores.llm import EmbeddingScheduler, RateLimitScheduler
+
+
+class APIError(Exception):
+    def __init__(self, code, message=""):
+        super().__init__(message or f"{code} error")
+        self.code = code
+
+
+def run_with_failures(errors, scheduler=None):
+    """Embeds three texts with a batch call that raises the given errors first; returns the call count."""
+    scheduler = scheduler or EmbeddingScheduler(max_retries=5, base_delay=0)
+    failures = list(errors)
+    calls = 0
+
+    async def embed_batch(batch):
+        nonlocal calls
+        calls += 1
+        if failures:
+            raise failures.pop(0)
+        return np.ones((len(batch), 2), dtype=np.float32)
+
+    asyncio.run(scheduler.run(["a", "b", "c"], embed_batch, dimension=2))
+    return calls
+
+
+@pytest.mark.parametrize("error", [
+    TypeError("bad argument"),
+    ValueError("bad input"),
+    APIError(400),
+    APIError(429),
+    APIError(None, "429 RESOURCE_EXHAUSTED"),
+])
+def test_does_not_retry_client_errors_or_rate_limits(error):
+    with pytest.raises(type(error)):
+        run_with_failures([error])
+
+
+@pytest.mark.parametrize("error", [
+    APIError(500),
+    APIError(503),
+    APIError(408),
+    httpx.ConnectError("connection refused"),
+    httpx.ReadTimeout("timed out"),
+    ConnectionResetError(),
+    asyncio.TimeoutError(),
+])
+def test_retries_transport_errors_and_server_errors(error):
+    scheduler = EmbeddingScheduler(max_batch_size=4, max_retries=5, base_delay=0)
+    assert run_with_failures([error, error], scheduler) == 3
+    assert scheduler.batch_size == 4
+
+
+def test_shrinks_batches_on_payload_too_large():
+    scheduler = EmbeddingScheduler(max_batch_size=4, max_retries=5, base_delay=0)
+    # the failed batch of three is re-split into single texts
+    assert run_with_failures([APIError(413)], scheduler) == 4
+
+
+def test_rate_limits_are_retried_by_one_layer_only():
+    rate_limiter = RateLimitScheduler(max_retries=2, base_delay=0)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise APIError(429)
+
+    async def embed_batch(batch):
+        return await rate_limiter.run(call)
+
+    scheduler = EmbeddingScheduler(max_retries=5, base_delay=0)
+    with pytest.raises(APIError):
+        asyncio.run(scheduler.run(["a"], embed_batch, dimension=2))
+    assert calls == 3
@@ -0,0 +1,29 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from stores.llm import EmbeddingScheduler
+from stores.llm.providers.HashingEmbeddingProvider import HashingEmbeddingProvider
+
+
+def test_embed_query_goes_through_the_scheduler():
+    scheduler = EmbeddingScheduler()
+    runs = []
+    run = scheduler.run
+
+    async def counting_run(texts, *args, **kwargs):
+        runs.append(list(texts))
+        return await run(texts, *args, **kwargs)
+
+    scheduler.run = counting_run
+    provider = HashingEmbeddingProvider(embedding_dimension=32, embedding_scheduler=scheduler)
+
+    vector = asyncio.run(provider.embed_query("python developer"))
+    assert runs == [["python developer"]]
+    assert np.allclose(vector, provider.encode(["python developer"])[0])
+
+
+def test_generate_raises_a_configuration_error():
+    with pytest.raises(ValueError, match="GENERATION_BACKEND"):
+        asyncio.run(HashingEmbeddingProvider().generate("hello"))
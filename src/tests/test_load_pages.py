@@ -0,0 +1,34 @@
+import pymupdf
+import pytest
+
+from controllers.ProcessController import load_file, load_pages
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "sample.pdf"
+    doc = pymupdf.open()
+    for number in range(7):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Chapter {number}", fontsize=20)
+        for line in range(12):
+            page.insert_text((72, 110 + 18 * line), f"Line {line} of page {number}, some body text.", fontsize=11)
+    doc.set_metadata({"title": " Sample ", "author": "Tests", "creationDate": "D:20240102030405+01'00'"})
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.mark.parametrize("window", [1, 3, 7, 10])
+def test_windows_match_load_file(pdf_path, window):
+    expected = load_file(pdf_path, "pdf")
+    windowed = [
+        document
+        for start in range(0, len(expected), window)
+        for document in load_pages(pdf_path, "pdf", start, start + window)
+    ]
+
+    assert len(windowed) == len(expected) == 7
+    for got, want in zip(windowed, expected):
+        assert got.page_content == want.page_content
+        assert got.metadata == want.metadata
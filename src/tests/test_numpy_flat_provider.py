@@ -0,0 +1,165 @@
+import asyncio
+import json
+import os
+
+import numpy as np
+import pytest
+
+from stores.vectordb.VectorDBEnums import VectorDBConfig
+from stores.vectordb.providers import NumpyFlatProvider
+
+
+def make_provider(path):
+    return NumpyFlatProvider(VectorDBConfig(
+        path=str(path), vector_db_type="NUMPY_FLAT", collection_name="chunks", embedding_dim=4,
+    ))
+
+
+def point_id(i):
+    return f"00000000-0000-0000-0000-{i:012d}"
+
+
+def unit(i):
+    vector = np.zeros(4, dtype=np.float32)
+    vector[i % 4] = 1
+    return vector
+
+
+async def fill(provider, count=8):
+    await provider.create_collection("chunks", embedding_dim=4)
+    await provider.upsert_to_collection(
+        "chunks",
+        np.stack([unit(i) for i in range(count)]),
+        [{"file_id": f"f{i % 2}", "rank": i} for i in range(count)],
+        [f"text {i}" for i in range(count)],
+        ids=[point_id(i) for i in range(count)],
+    )
+
+
+def test_upsert_and_search(tmp_path):
+    provider = make_provider(tmp_path)
+
+    async def run():
+        await fill(provider)
+        return await provider.search_collection("chunks", unit(1), k=2)
+
+    results = asyncio.run(run())
+    assert {result.id for result in results} == {point_id(1), point_id(5)}
+    assert all(result.score == pytest.approx(1.0) for result in results)
+    assert results[0].content in ("text 1", "text 5")
+
+
+def test_replace_keeps_one_row_per_id(tmp_path):
+    provider = make_provider(tmp_path)
+
+    async def run():
+        await fill(provider)
+        await provider.upsert_to_collection("chunks", unit(2)[None], [{"file_id": "f9"}], ["new"], ids=[point_id(1)])
+        return (
+            await provider.count_points("chunks"),
+            await provider.search_collection("chunks", unit(2), k=3, filters={"file_id": "f9"}),
+        )
+
+    count, results = asyncio.run(run())
+    assert count == 8
+    assert [(result.id, result.content) for result in results] == [(point_id(1), "new")]
+
+
+def test_delete_points_and_by_filter(tmp_path):
+    provider = make_provider(tmp_path)
+
+    async def run():
+        await fill(provider)
+        await provider.delete_points("chunks", [point_id(0), point_id(3), "missing"])
+        await provider.delete_by_filter("chunks", {"file_id": "f1"})
+        return await provider.list_point_ids("chunks")
+
+    assert asyncio.run(run()) == {point_id(2), point_id(4), point_id(6)}
+
+
+def test_filtered_search(tmp_path):
+    provider = make_provider(tmp_path)
+
+    async def run():
+        await fill(provider)
+        return await provider.search_collection(
+            "chunks", unit(0), k=10, filters={"file_id": "f0", "rank": {"gte": 2}}
+        )
+
+    results = asyncio.run(run())
+    assert {result.id for result in results} == {point_id(2), point_id(4), point_id(6)}
+    assert results[0].id == point_id(4)
+
+
+def test_search_groups(tmp_path):
+    provider = make_provider(tmp_path)
+
+    async def run():
+        await fill(provider)
+        return await provider.search_groups("chunks", unit(1), group_by="file_id", groups=2, group_size=2)
+
+    groups = asyncio.run(run())
+    assert [group.id for group in groups] == ["f1", "f0"]
+    assert {hit.id for hit in groups[0].hits} == {point_id(1), point_id(5)}
+    assert all(len(group.hits) == 2 for group in groups)
+
+
+def test_reload_drops_rows_of_an_interrupted_append(tmp_path):
+    asyncio.run(fill(make_provider(tmp_path)))
+    path = os.path.join(tmp_path, NumpyFlatProvider.ROOT_DIRECTORY, "chunks")
+    # an append that wrote its rows but crashed before committing meta.json
+    with open(os.path.join(path, "vectors.f32"), "ab") as f:
+        f.write(unit(0).tobytes() * 2)
+    with open(os.path.join(path, "payloads.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps([point_id(100), {"text": "lost"}]) + "\n")
+        f.write('["00000000-0000-0000-0000-0000')
+
+    provider = make_provider(tmp_path)
+
+    async def run():
+        ids = await provider.list_point_ids("chunks")
+        await provider.upsert_to_collection("chunks", unit(3)[None], [{}], ["after"], ids=[point_id(200)])
+        return ids
+
+    assert asyncio.run(run()) == {point_id(i) for i in range(8)}
+    reloaded = make_provider(tmp_path)
+    assert asyncio.run(reloaded.list_point_ids("chunks")) == {point_id(i) for i in range(8)} | {point_id(200)}
+    assert os.path.getsize(os.path.join(path, "vectors.f32")) == 9 * 4 * 4
+
+
+def test_interrupted_compaction_keeps_the_committed_generation(tmp_path, monkeypatch):
+    provider = make_provider(tmp_path)
+    asyncio.run(fill(provider))
+
+    def crash(*args, **kwargs):
+        raise OSError("crashed before commit")
+
+    monkeypatch.setattr(provider, "_write_meta", crash)
+    with pytest.raises(OSError):
+        asyncio.run(provider.delete_points("chunks", [point_id(0)]))
+
+    path = os.path.join(tmp_path, NumpyFlatProvider.ROOT_DIRECTORY, "chunks")
+    assert "vectors.1.f32" in os.listdir(path)
+    reloaded = make_provider(tmp_path)
+    assert asyncio.run(reloaded.count_points("chunks")) == 8
+    assert sorted(os.listdir(path)) == ["meta.json", "payloads.jsonl", "vectors.f32"]
+
+    asyncio.run(reloaded.delete_points("chunks", [point_id(0)]))
+    again = make_provider(tmp_path)
+    assert asyncio.run(again.count_points("chunks")) == 7
+    assert sorted(os.listdir(path)) == ["meta.json", "payloads.1.jsonl", "vectors.1.f32"]
+
+
+def test_cold_reads_load_under_the_collection_lock(tmp_path):
+    asyncio.run(fill(make_provider(tmp_path)))
+    provider = make_provider(tmp_path)
+    load = provider._load
+    locked = []
+
+    def checked_load(collection_name):
+        locked.append(provider._lock(collection_name).locked())
+        return load(collection_name)
+
+    provider._load = checked_load
+    asyncio.run(provider.search_collection("chunks", unit(0), k=1))
+    assert locked == [True]
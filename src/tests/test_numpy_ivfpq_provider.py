@@ -0,0 +1,104 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from stores.vectordb.VectorDBEnums import VectorDBConfig
+from stores.vectordb.providers import NumpyIVFPQProvider
+
+
+def make_provider(path, train_size=300, rerank_factor=0):
+    return NumpyIVFPQProvider(VectorDBConfig(
+        path=str(path),
+        vector_db_type="NUMPY_IVFPQ",
+        collection_name="chunks",
+        embedding_dim=16,
+        ivf_nlist=4,
+        pq_m=4,
+        ivf_train_size=train_size,
+        ivf_min_train_points=256,
+        ivf_rerank_factor=rerank_factor,
+    ))
+
+
+async def append(provider, rng, start, count):
+    vectors = rng.standard_normal((count, 16)).astype(np.float32)
+    await provider.upsert_to_collection(
+        "chunks", vectors, [{} for _ in range(count)], ["" for _ in range(count)],
+        ids=[f"00000000-0000-0000-0000-{i:012d}" for i in range(start, start + count)],
+    )
+
+
+def test_retrains_only_after_collection_quadruples(tmp_path, monkeypatch):
+    provider = make_provider(tmp_path)
+    trained_at = []
+    build_index = provider._build_index
+
+    def counting_build_index(collection):
+        index = build_index(collection)
+        if index is not None:
+            trained_at.append(len(collection.ids))
+        return index
+
+    monkeypatch.setattr(provider, "_build_index", counting_build_index)
+    rng = np.random.default_rng(0)
+
+    async def run():
+        await provider.create_collection("chunks", 16)
+        for start in range(0, 3000, 100):
+            await append(provider, rng, start, 100)
+
+    asyncio.run(run())
+    # the training sample is capped at 300, so comparing against it would retrain every append past 1200
+    assert trained_at == [300, 1200]
+
+
+def test_collection_size_survives_reload(tmp_path):
+    provider = make_provider(tmp_path)
+    rng = np.random.default_rng(1)
+
+    async def run():
+        await provider.create_collection("chunks", 16)
+        await append(provider, rng, 0, 600)
+
+    asyncio.run(run())
+    reloaded = make_provider(tmp_path)
+    index = reloaded._load("chunks").index
+    assert index.trained_count == 300
+    assert index.collection_size == 600
+
+
+def test_index_is_carried_over_by_replace_and_delete(tmp_path):
+    provider = make_provider(tmp_path)
+    rng = np.random.default_rng(0)
+
+    async def run():
+        await provider.create_collection("chunks", embedding_dim=16)
+        await append(provider, rng, 0, 300)
+        await append(provider, rng, 290, 20)
+        await provider.delete_points("chunks", [f"00000000-0000-0000-0000-{i:012d}" for i in range(5)])
+        return provider._collections["chunks"]
+
+    collection = asyncio.run(run())
+    assert len(collection.ids) == 305
+    assert collection.index is not None
+    assert len(collection.index.lists) == len(collection.index.codes) == 305
+
+
+def test_rerank_factor_one_rescores_exactly(tmp_path):
+    provider = make_provider(tmp_path, rerank_factor=1)
+    rng = np.random.default_rng(1)
+    query = rng.standard_normal(16).astype(np.float32)
+
+    async def run():
+        await provider.create_collection("chunks", embedding_dim=16)
+        await append(provider, rng, 0, 400)
+        return await provider.search_collection("chunks", query, k=5)
+
+    results = asyncio.run(run())
+    collection = provider._collections["chunks"]
+    prepared = provider._prepare_vectors(query, collection.distance)[0]
+    exact = {point_id: float(collection.vectors[row] @ prepared) for row, point_id in enumerate(collection.ids)}
+    assert len(results) == 5
+    assert [result.score for result in results] == pytest.approx([exact[result.id] for result in results], rel=1e-5)
+    assert [result.score for result in results] == sorted((result.score for result in results), reverse=True)
@@ -0,0 +1,75 @@
+import logging
+import random
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from utils import RecursiveTextSplitter
+
+SEPARATORS = ["\n\n", "\n", " ", ""]
+# separator-heavy pieces plus tokens longer than most chunk sizes
+ALPHABET = ["a", "bb", "ccc", "word", "x" * 50, "y" * 700, " ", "  ", "\n", "\n\n", "\n\n\n", " \n", "\t"]
+
+
+@pytest.fixture(autouse=True)
+def quiet_langchain():
+    # LangChain warns on every over-long chunk
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def reference_split(text, chunk_size, chunk_overlap):
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=SEPARATORS,
+        length_function=len,
+    ).split_text(text)
+
+
+def random_text(rng, max_pieces=400):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_pieces)))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 10, 50, 100, 300, 600, 1000])
+def test_matches_langchain_on_random_texts(chunk_size):
+    rng = random.Random(chunk_size)
+    for _ in range(150):
+        text = random_text(rng, max_pieces=200)
+        chunk_overlap = rng.randint(0, chunk_size)
+        expected = reference_split(text, chunk_size, chunk_overlap)
+        assert RecursiveTextSplitter(chunk_size, chunk_overlap, SEPARATORS).split_text(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "   ",
+    "\n\n\n\n",
+    "word",
+    "a" * 2500,
+    "one two three\n\nfour five\nsix " * 40,
+    "\n\nleading and trailing separators\n\n",
+])
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(10, 0), (10, 10), (100, 20), (1000, 200)])
+def test_matches_langchain_on_edge_cases(text, chunk_size, chunk_overlap):
+    expected = reference_split(text, chunk_size, chunk_overlap)
+    assert RecursiveTextSplitter(chunk_size, chunk_overlap, SEPARATORS).split_text(text) == expected
+
+
+def test_matches_langchain_on_prose():
+    rng = random.Random(0)
+    words = "python engineer data kubernetes resume experience project team lead senior".split()
+    text = "\n\n".join(
+        "\n".join(" ".join(rng.choice(words) for _ in range(rng.randint(3, 20))) for _ in range(rng.randint(1, 8)))
+        for _ in range(300)
+    )
+    for chunk_size, chunk_overlap in [(600, 200), (1000, 200), (300, 0)]:
+        expected = reference_split(text, chunk_size, chunk_overlap)
+        assert RecursiveTextSplitter(chunk_size, chunk_overlap, SEPARATORS).split_text(text) == expected
+
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(0, 0), (10, -1), (10, 11)])
+def test_rejects_invalid_parameters(chunk_size, chunk_overlap):
+    with pytest.raises(ValueError):
+        RecursiveTextSplitter(chunk_size, chunk_overlap)
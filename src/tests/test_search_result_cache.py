@@ -0,0 +1,24 @@
+from stores.vectordb import SearchResultCache
+
+
+def test_rewriting_a_key_does_not_grow_the_cache(tmp_path):
+    cache = SearchResultCache(path=str(tmp_path / "results.sqlite3"), max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    for value in range(5):
+        cache.put("a", [value])
+
+    assert cache.get_stats()["entries"] == cache._count() == 2
+    assert cache.evictions == 0
+    assert cache.get("a") == [4]
+    assert cache.get("b") == [2]
+
+
+def test_new_keys_evict_the_least_recently_used(tmp_path):
+    cache = SearchResultCache(path=str(tmp_path / "results.sqlite3"), max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    cache.put("c", [3])
+
+    assert cache.evictions == 1
+    assert cache.get_stats()["entries"] == 2
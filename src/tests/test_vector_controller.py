@@ -0,0 +1,81 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from controllers import VectorController
+from models import Project
+from stores.vectordb import VectorDBFactory
+from stores.vectordb.VectorDBEnums import VectorDBConfig
+from stores.vectordb.providers import NumpyFlatProvider, QdrantdbProvider
+
+
+def make_flat_provider(path):
+    return NumpyFlatProvider(VectorDBConfig(
+        path=str(path), vector_db_type="NUMPY_FLAT", collection_name="chunks", embedding_dim=4,
+    ))
+
+
+def make_qdrant_provider(path):
+    return QdrantdbProvider(VectorDBConfig(
+        path=str(path), vector_db_type="QDRANT", collection_name="chunks", embedding_dim=4,
+    ))
+
+
+@pytest.mark.filterwarnings("ignore:Payload indexes have no effect")
+@pytest.mark.parametrize("make_provider", [make_flat_provider, make_qdrant_provider])
+def test_delete_by_ids_stays_within_tenant(tmp_path, make_provider):
+    provider = make_provider(tmp_path)
+    controller = VectorController(provider, embedding_model=None)
+    controller.shared_tenancy = True
+    collection_name = controller.create_collection_name("a")
+    ids = {"a": ["00000000-0000-0000-0000-00000000000a"], "b": ["00000000-0000-0000-0000-00000000000b"]}
+
+    async def run():
+        await provider.create_collection(collection_name, embedding_dim=4)
+        for project_id, point_ids in ids.items():
+            await provider.upsert_to_collection(
+                collection_name, np.ones((1, 4), dtype=np.float32),
+                [{VectorDBFactory.TENANT_FIELD: project_id}], [""], ids=point_ids,
+            )
+        await controller.delete_vectors_by_ids("a", ids["a"] + ids["b"])
+        return await provider.list_point_ids(collection_name)
+
+    assert asyncio.run(run()) == set(ids["b"])
+
+
+class NoVectorProvider:
+    """A misconfigured provider: every embed call returns None."""
+
+    embedding_dimension = 4
+
+    async def embed_query(self, text):
+        return None
+
+    async def embed_queries(self, texts):
+        return None
+
+    async def embed_documents(self, texts):
+        return None
+
+
+@pytest.mark.parametrize("search", [
+    lambda controller, project: controller.search_vectors(project, "python"),
+    lambda controller, project: controller.search_vector_groups(project, "python"),
+    lambda controller, project: controller.search_vectors_batch(project, ["python", "java"]),
+    lambda controller, project: controller.evaluate_recall(project, ["python"]),
+])
+def test_failed_query_embedding_never_reaches_search(tmp_path, search):
+    provider = make_flat_provider(tmp_path)
+    searches = []
+
+    async def recording_search(*args, **kwargs):
+        searches.append(kwargs)
+        return []
+
+    provider.search_collection = provider.search_batch = provider.search_groups = recording_search
+    controller = VectorController(provider, embedding_model=NoVectorProvider())
+
+    with pytest.raises(RuntimeError, match="Failed to embed"):
+        asyncio.run(search(controller, Project(project_id="p")))
+    assert searches == []
@@ -0,0 +1,105 @@
+import re
+import zlib
+from typing import Container, Hashable, Optional
+import numpy as np
+
+
+class NearDuplicateDetector:
+    """
+    MinHash / LSH index for finding near-duplicate texts.
+
+    A text is reduced to its set of word shingles. num_perm MinHash values are
+    cut into `bands` bands; texts sharing any band key become candidates, and
+    a candidate is accepted when the exact Jaccard similarity of the shingle
+    sets reaches `threshold`. Band keys are plain ints, so they can be stored
+    with a record and looked up in a database.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+    MERSENNE_PRIME = (1 << 31) - 1
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, self.MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, self.MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._shingles: dict[Hashable, np.ndarray] = {}
+        self._buckets: dict[int, list[Hashable]] = {}
+        self._band_keys: dict[Hashable, list[int]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._shingles
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Sorted unique hashes of the text's word shingles (the words themselves for short texts)."""
+        words = self.TOKEN_PATTERN.findall(text.lower())
+        size = min(self.shingle_size, len(words))
+        hashes = {
+            zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(len(words) - size + 1)
+        } if size else set()
+        return np.fromiter(sorted(hashes), dtype=np.uint64, count=len(hashes))
+
+    def band_keys(self, shingles: np.ndarray) -> list[int]:
+        if not len(shingles):
+            return []
+        # all permutations at once: (num_perm, n_shingles), values < 2**62 so uint64 never overflows
+        signature = ((self._a * (shingles % self.MERSENNE_PRIME) + self._b) % self.MERSENNE_PRIME).min(axis=1)
+        bands = signature.astype(np.uint32).reshape(self.bands, self.rows)
+        return [(band << 32) | zlib.crc32(bands[band].tobytes()) for band in range(self.bands)]
+
+    @staticmethod
+    def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+        if not len(a) and not len(b):
+            return 1.0
+        common = len(np.intersect1d(a, b, assume_unique=True))
+        return common / (len(a) + len(b) - common)
+
+    def add(self, key: Hashable, shingles: np.ndarray, band_keys: list[int]):
+        if key in self._shingles:
+            return
+        self._shingles[key] = shingles
+        self._band_keys[key] = list(band_keys)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def remove(self, key: Hashable):
+        if self._shingles.pop(key, None) is None:
+            return
+        for band_key in self._band_keys.pop(key):
+            bucket = self._buckets.get(band_key)
+            if bucket is None:
+                continue
+            if key in bucket:
+                bucket.remove(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def find(self, shingles: np.ndarray, band_keys: list[int],
+             exclude: Container[Hashable] = ()) -> Optional[Hashable]:
+        """Key of the most similar indexed text at or above the threshold, if any, ignoring excluded keys."""
+        best_key, best_similarity = None, self.threshold
+        checked = set()
+        for band_key in band_keys:
+            for key in self._buckets.get(band_key, ()):
+                if key in checked or key in exclude:
+                    continue
+                checked.add(key)
+                similarity = self.jaccard(shingles, self._shingles[key])
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+        return best_key
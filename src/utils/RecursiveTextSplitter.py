@@ -0,0 +1,102 @@
+from collections import deque
+
+
+class RecursiveTextSplitter:
+    """
+    Recursive character splitter that works on offsets into one string.
+
+    Produces the same chunks as LangChain's RecursiveCharacterTextSplitter with
+    keep_separator=True, strip_whitespace=True and length_function=len:
+    the first separator found in a span splits it (each piece keeps its
+    leading separator), pieces shorter than chunk_size are merged greedily
+    with chunk_overlap carried over, and longer pieces recurse with the
+    remaining separators. Pieces are (start, end) offsets; the only strings
+    created are the final chunks.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, separators: list[str] = None):
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+        if chunk_overlap < 0:
+            raise ValueError(f"chunk_overlap must be >= 0, got {chunk_overlap}")
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size}), should be smaller."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators or ["\n\n", "\n", " ", ""]
+
+    def split_text(self, text: str) -> list[str]:
+        chunks = []
+        self._split(text, 0, len(text), 0, chunks)
+        return chunks
+
+    @staticmethod
+    def _pieces(text: str, start: int, end: int, separator: str) -> list[tuple[int, int]]:
+        """Offsets of the non-empty pieces of text[start:end], each starting with its separator."""
+        if not separator:
+            return [(i, i + 1) for i in range(start, end)]
+        pieces = []
+        piece_start = start
+        step = len(separator)
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > piece_start:
+                pieces.append((piece_start, position))
+            piece_start = position
+            position = text.find(separator, position + step, end)
+        if end > piece_start:
+            pieces.append((piece_start, end))
+        return pieces
+
+    def _split(self, text: str, start: int, end: int, level: int, chunks: list[str]):
+        separators = self.separators
+        separator = separators[-1]
+        next_level = len(separators)
+        for i in range(level, len(separators)):
+            if not separators[i]:
+                separator = separators[i]
+                break
+            if text.find(separators[i], start, end) != -1:
+                separator = separators[i]
+                next_level = i + 1
+                break
+
+        # consecutive pieces are adjacent, so a run of them is just (run_start, run_end)
+        run = []
+        for piece_start, piece_end in self._pieces(text, start, end, separator):
+            if piece_end - piece_start < self.chunk_size:
+                run.append((piece_start, piece_end))
+                continue
+            if run:
+                self._merge(text, run, chunks)
+                run = []
+            if next_level >= len(separators):
+                chunks.append(text[piece_start:piece_end])
+            else:
+                self._split(text, piece_start, piece_end, next_level, chunks)
+        if run:
+            self._merge(text, run, chunks)
+
+    def _merge(self, text: str, pieces: list[tuple[int, int]], chunks: list[str]):
+        """Greedy merge of adjacent pieces into chunks, keeping up to chunk_overlap characters of context."""
+        window = deque()
+        total = 0
+        for piece_start, piece_end in pieces:
+            length = piece_end - piece_start
+            if total + length > self.chunk_size and window:
+                self._emit(text, window[0][0], window[-1][1], chunks)
+                while window and (total > self.chunk_overlap or total + length > self.chunk_size):
+                    first_start, first_end = window.popleft()
+                    total -= first_end - first_start
+            window.append((piece_start, piece_end))
+            total += length
+        if window:
+            self._emit(text, window[0][0], window[-1][1], chunks)
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, chunks: list[str]):
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
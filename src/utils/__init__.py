@@ -1,2 +1,4 @@
 from .config import get_settings
 from .config import Settings
+from .RecursiveTextSplitter import RecursiveTextSplitter
+from .NearDuplicateDetector import NearDuplicateDetector
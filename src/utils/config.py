@@ -1,6 +1,7 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional, Dict
 
 
 class Settings(BaseSettings):
@@ -23,6 +24,20 @@ class Settings(BaseSettings):
     FILE_CHUNK_SIZE: int = Field(default=512000)
     FILE_DEFAULT_CHUNK_SIZE: int = Field(default=1048576)
     FILE_BYTES_TO_MB: int = Field(default=1048576)
+    ASSET_STORE_DIRECTORY: str = Field(default="assets/store")
+    ASSET_STORE_SHARD_DEPTH: int = Field(default=2)
+
+    # ── Document Processing Settings ─────────────────────────────────────
+    PARSER_MAX_WORKERS: int = Field(default=4)
+    PARSER_PAGE_WINDOW: int = Field(default=8)
+    PARSER_PARALLEL_MIN_PAGES: int = Field(default=32)
+    CHUNK_FLUSH_BATCH_SIZE: int = Field(default=200)
+    PARSED_TEXT_CACHE_ENABLED: bool = Field(default=True)
+    PARSED_TEXT_CACHE_NAME: str = Field(default="parsed_text_cache")
+    CHUNK_DEDUP_MODE: str = Field(default="flag")
+    CHUNK_DEDUP_THRESHOLD: float = Field(default=0.9)
+    CHUNK_DEDUP_NUM_PERM: int = Field(default=128)
+    CHUNK_DEDUP_BANDS: int = Field(default=16)
 
     # ── Database Settings (MongoDB) ──────────────────────────────────────
     MONGO_DB: str = Field(default="mongodb://localhost:27017")
@@ -39,6 +54,28 @@ class Settings(BaseSettings):
     GENERATION_MODEL_ID: str = Field(default="llama-3.3-70b-versatile")
     EMBEDDING_MODEL_ID: str = Field(default="gemini-embedding-001")
     EMBEDDING_MODEL_SIZE: int = Field(default=768)
+    HASHING_EMBEDDING_LATENCY_MS: float = Field(default=0.0)
+
+    # ── Embedding Batching ───────────────────────────────────────────────
+    EMBEDDING_BATCH_SIZE: int = Field(default=100)
+    EMBEDDING_BATCH_MAX_CHARS: int = Field(default=80000)
+    EMBEDDING_MAX_CONCURRENCY: int = Field(default=4)
+    EMBEDDING_MAX_RETRIES: int = Field(default=5)
+    EMBEDDING_RETRY_BASE_DELAY: float = Field(default=1.0)
+
+    # ── Rate Limiting (shared by all Gemini calls) ───────────────────────
+    GEMINI_REQUESTS_PER_MINUTE: int = Field(default=1500)
+    GEMINI_TOKENS_PER_MINUTE: int = Field(default=1000000)
+    GEMINI_RATE_LIMIT_MAX_RETRIES: int = Field(default=6)
+    GEMINI_RATE_LIMIT_MAX_DELAY: float = Field(default=60.0)
+
+    # ── Embedding Cache ──────────────────────────────────────────────────
+    EMBEDDING_CACHE_ENABLED: bool = Field(default=True)
+    EMBEDDING_CACHE_NAME: str = Field(default="embedding_cache")
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(default=200000)
+    QUERY_CACHE_ENABLED: bool = Field(default=True)
+    QUERY_CACHE_MAX_ENTRIES: int = Field(default=10000)
+    QUERY_CACHE_TTL_SECONDS: float = Field(default=3600.0)
 
     # ── API Keys ─────────────────────────────────────────────────────────
     GROQ_API_KEY: str = Field(default="")
@@ -50,6 +87,32 @@ class Settings(BaseSettings):
     VECTOR_DB_NAME: str = Field(default="vector_db")
     VECTOR_DB_DISTANCE: str = Field(default="cosine")
     VECTOR_DB_COLLECTION_NAME: str = Field(default="chunks")
+    VECTOR_DB_QUANTIZATION: str = Field(default="none")
+    VECTOR_DB_QUANTIZATION_ALWAYS_RAM: bool = Field(default=True)
+    VECTOR_DB_ON_DISK_VECTORS: bool = Field(default=False)
+    VECTOR_DB_HNSW_M: Optional[int] = Field(default=None)
+    VECTOR_DB_HNSW_EF_CONSTRUCT: Optional[int] = Field(default=None)
+    VECTOR_DB_SEARCH_HNSW_EF: Optional[int] = Field(default=None)
+    VECTOR_DB_SEARCH_RESCORE: bool = Field(default=True)
+    VECTOR_DB_SEARCH_OVERSAMPLING: Optional[float] = Field(default=None)
+    VECTOR_DB_IVF_NLIST: int = Field(default=1024)
+    VECTOR_DB_IVF_NPROBE: int = Field(default=16)
+    VECTOR_DB_PQ_M: int = Field(default=64)
+    VECTOR_DB_IVF_TRAIN_SIZE: int = Field(default=65536)
+    VECTOR_DB_IVF_MIN_TRAIN_POINTS: int = Field(default=20000)
+    VECTOR_DB_IVF_RERANK_FACTOR: int = Field(default=0)
+    VECTOR_DB_TENANCY: str = Field(default="collection")
+    VECTOR_DB_SHARED_COLLECTION_NAME: str = Field(default="projects")
+    VECTOR_DB_PAYLOAD_INDEXES: Dict[str, str] = Field(default={"file_id": "keyword", "page": "integer"})
+    VECTOR_UPSERT_WINDOW_SIZE: int = Field(default=256)
+    VECTOR_UPSERT_QUEUE_SIZE: int = Field(default=2)
+    VECTOR_SUMMARY_ENABLED: bool = Field(default=True)
+
+    # ── Search Result Cache ──────────────────────────────────────────────
+    SEARCH_CACHE_ENABLED: bool = Field(default=True)
+    SEARCH_CACHE_BACKEND: str = Field(default="memory")
+    SEARCH_CACHE_NAME: str = Field(default="search_cache")
+    SEARCH_CACHE_MAX_ENTRIES: int = Field(default=10000)
 
 
 